@@ -1,5 +1,6 @@
-from numpy import power, array, zeros, sqrt, abs,\
-    tan, sign, spacing, size, cos, divide, add
+from numpy import array, abs, tan, sign, spacing, transpose, clip, where,\
+    zeros, zeros_like, moveaxis, power, ndim, dot
+from kinematics import kinematics, parameter_columns
 
 class ArrudaBoyce:
     """Represents the Arruda-Boyce model."""
@@ -9,81 +10,137 @@ class ArrudaBoyce:
         self.paramnames = ["mu", "lambda_lock"]
         self.paramnames_latex = ['\mu', '\lambda_{lock}']
         self.paramcount = len(self.paramnames)
-    
+        self.linear = False
+        # The inverse Langevin approximation is piecewise and clipped,
+        # so complex-step differentiation does not apply.
+        self.complex_step = False
+        # The constraints mu >= 0 and lambda_lock >= 0 are linear.
+        # The stress is even in lambda_lock, so the bound keeps
+        # unbounded methods off the unphysical mirror solution.
+        self.constraint_matrix = [[1.0, 0.0], [0.0, 1.0]]
+
         self.a = 1.31446
         self.b = 1.58986
         self.c = 0.91209
         self.d = 0.84136
+        self.lock_cache = (None, None)
 
-    def lambda_chain_ut(self, stretch):
-        i1 = add(power(stretch, 2), divide(2, stretch))
-        return sqrt(i1 / 3)
-
-    def lambda_chain_et(self, stretch):
-         i1 = add(2 * power(stretch, 2), power(stretch, -4))
-         return sqrt(i1 / 3)
-
-    def lambda_chain_ps(self, stretch):
-        i1 = add(power(stretch, 2), add(1, power(stretch, -2)))
-        return sqrt(i1 / 3)
+    def inv_langevin_terms(self, x, order=1):
+        """Returns the approximation of the inverse Langevin function
+        and its derivatives up to the given order (0, 1 or 2) at x.
+        Both branches are evaluated on safe arguments and selected,
+        x is not modified."""
+        eps = spacing(1)
+        x = clip(x, -1 + eps, 1 - eps)
+        inner = abs(x) < self.d
+        tangent = tan(self.b * where(inner, x, 0.0))
+        pole = 1.0 / (sign(x) - where(inner, 0.5, x))
+        value = where(inner, self.a * tangent + self.c * x, pole)
+        if order == 0:
+            return value
+        secant2 = 1.0 + tangent * tangent
+        der = where(inner, self.a * self.b * secant2 + self.c, pole * pole)
+        if order == 1:
+            return value, der
+        der2 = where(inner, 2 * self.a * self.b * self.b * secant2 * tangent,
+                     2 * pole * pole * pole)
+        return value, der, der2
 
     def inv_langevin(self, x):
-        eps = spacing(1)
-        # x is a scalar
-        if isinstance(x, float):
-            if x >= 1 - eps:
-                x = 1 - eps
-            if x <= -1 + eps:
-                x = -1 + eps
-            if abs(x) < self.d:
-                return self.a * tan(self.b * x) + self.c * x
-            return 1.0 / (sign(x) - x)
-        # x is an array
-        x[x >= 1 - eps] = 1 - eps
-        x[x <= -1 + eps] = -1 + eps
-        res = zeros(size(x))
-        index = abs(x) < self.d
-        res[index] = self.a * tan(self.b * x[index]) + self.c * x[index]
-        index = abs(x) >= self.d
-        res[index] = 1.0 / (sign(x[index]) - x[index])
-        return res
+        return self.inv_langevin_terms(x, 0)
 
     def inv_langevin_der(self, x):
-        eps = spacing(1)
-        # x is a scalar
-        if isinstance(x, float):
-            if x >= 1 - eps:
-                x = 1 - eps
-            if x <= -1 + eps:
-                x = -1 + eps
-            if abs(x) < self.d:
-                return self.a * self.b / power(cos(self.b * x),2) + self.c
-            return 1.0 / power(sign(x) - x,2)
-        # x is an array
-        x[x >= 1 - eps] = 1 - eps
-        x[x <= -1 + eps] = -1 + eps
-        res = zeros(size(x))
-        index = abs(x) < self.d
-        res[index] = self.a * self.b / power(cos(self.b * x[index]),2) + self.c
-        index = abs(x) >= self.d
-        res[index] = 1.0 / power(sign(x[index]) - x[index],2)
-        return res
-
-    def right(self, stretch, c):
-        return power(stretch, 2) - power(stretch, -c)
-
-    def f(self, stretch, c, lambda_chain, mu, lambda_lock):
-        return mu / lambda_chain * self.inv_langevin(lambda_chain / lambda_lock) / self.inv_langevin(1 / lambda_lock) * self.right(stretch, c)
-
-    def jac(self, stretch, c, lambda_chain, mu, lambda_lock):
-        return array([1 / lambda_chain * self.inv_langevin(lambda_chain / lambda_lock) / self.inv_langevin(1 / lambda_lock) * self.right(stretch, c),
-                      mu / lambda_chain * self.right(stretch, c) / power(lambda_lock * self.inv_langevin(1 / lambda_lock), 2) * \
-                          (self.inv_langevin_der(1 / lambda_lock) * self.inv_langevin(lambda_chain / lambda_lock) - \
-                          lambda_chain * self.inv_langevin_der(lambda_chain / lambda_lock) * self.inv_langevin(1 / lambda_lock))])
+        return self.inv_langevin_terms(x, 1)[1]
+
+    def inv_langevin_der2(self, x):
+        return self.inv_langevin_terms(x, 2)[2]
+
+    def lock_terms(self, lambda_lock):
+        """Returns the inverse Langevin function of 1 / lambda_lock and
+        its first two derivatives. They depend on the parameters only,
+        so they are calculated once per lambda_lock."""
+        if ndim(lambda_lock) > 0:
+            # A batch of parameter vectors is evaluated.
+            return self.inv_langevin_terms(1 / lambda_lock, 2)
+        # The model is shared by the fit and the plots in other threads,
+        # so the cached pair is read once and replaced as a whole.
+        cached = self.lock_cache
+        if cached[0] != lambda_lock:
+            cached = (lambda_lock, self.inv_langevin_terms(1 / lambda_lock, 2))
+            self.lock_cache = cached
+        return cached[1]
+
+    def right(self, kin, c):
+        return kin.power(2) - kin.power(-c)
+
+    def f(self, kin, c, mu, lambda_lock):
+        lambda_chain = kin.lambda_chain()
+        num = self.inv_langevin_terms(lambda_chain / lambda_lock, 0)
+        den = self.lock_terms(lambda_lock)[0]
+        return mu / lambda_chain * num / den * self.right(kin, c)
+
+    def jac(self, kin, c, mu, lambda_lock):
+        lambda_chain = kin.lambda_chain()
+        num, num1 = self.inv_langevin_terms(lambda_chain / lambda_lock, 1)
+        den, den1, den2 = self.lock_terms(lambda_lock)
+        k = self.right(kin, c) / lambda_chain
+        return array([k * num / den,
+                      mu * k / power(lambda_lock * den, 2) * \
+                          (den1 * num - lambda_chain * num1 * den)])
+
+    def f_and_jac(self, kin, c, mu, lambda_lock):
+        lambda_chain = kin.lambda_chain()
+        # The inverse Langevin function is evaluated once
+        # for the stress and the derivatives.
+        num, num1 = self.inv_langevin_terms(lambda_chain / lambda_lock, 1)
+        den, den1, den2 = self.lock_terms(lambda_lock)
+        k = self.right(kin, c) / lambda_chain
+        dmu = k * num / den
+        return mu * dmu, array([dmu,
+                                mu * k / power(lambda_lock * den, 2) * \
+                                    (den1 * num - lambda_chain * num1 * den)])
+
+    def lock_derivatives(self, kin, lambda_lock):
+        """Returns the first and second derivatives by lambda_lock of
+        F = IL(u) / IL(v), u = lambda_chain / lambda_lock, v = 1 / lambda_lock."""
+        lambda_chain = kin.lambda_chain()
+        u = lambda_chain / lambda_lock
+        v = 1 / lambda_lock
+        num, num1, num2 = self.inv_langevin_terms(u, 2)
+        den, den1, den2 = self.lock_terms(lambda_lock)
+        # Derivatives of the numerator and denominator by lambda_lock.
+        dnum = -num1 * u / lambda_lock
+        dden = -den1 * v / lambda_lock
+        ddnum = (num2 * u * u + 2 * num1 * u) / lambda_lock ** 2
+        ddden = (den2 * v * v + 2 * den1 * v) / lambda_lock ** 2
+        dF = (dnum * den - num * dden) / den ** 2
+        ddF = (ddnum * den - num * ddden) / den ** 2 - \
+            2 * dden * (dnum * den - num * dden) / den ** 3
+        return dF, ddF
+
+    def hess(self, kin, c, mu, lambda_lock):
+        lambda_chain = kin.lambda_chain()
+        # The stress is mu * K * F(lambda_lock) with
+        # F = IL(u) / IL(v), u = lambda_chain / lambda_lock, v = 1 / lambda_lock.
+        k = self.right(kin, c) / lambda_chain
+        dF, ddF = self.lock_derivatives(kin, lambda_lock)
+        return array([[zeros_like(k), k * dF],
+                      [k * dF, mu * k * ddF]])
+
+    def weighted_hess(self, kin, c, weights, mu, lambda_lock):
+        k = weights * self.right(kin, c) / kin.lambda_chain()
+        dF, ddF = self.lock_derivatives(kin, lambda_lock)
+        mixed = dot(k, dF)
+        return array([[0.0, mixed],
+                      [mixed, mu * dot(k, ddF)]])
 
     def constraint(self, x):
-        """Returns the constrain of the Arruda-Boyce model."""
-        return x[0]
+        """Returns the constrains of the Arruda-Boyce model."""
+        return [x[0], x[1]]
+
+    def constraint_jac(self, x):
+        """Returns the Jacobian matrix of the constrain of the Arruda-Boyce model."""
+        return array(self.constraint_matrix)
 
     def guess(self):
         return [0.2, 10]
@@ -97,6 +154,37 @@ class ArrudaBoyce:
             return self.ps(stretch, mu, lambda_lock)
         raise NotImplementedError
 
+    def values(self, defmode, stretch, params):
+        """Returns the stress vector of size (n,) of the Arruda-Boyce model
+        at the stretch array of size (n,) or its Kinematics in one call.
+        For a parameter matrix of size (m, p) the stress matrix
+        of size (m, n) is returned."""
+        return self.getfunc(defmode)(kinematics(defmode, stretch), *parameter_columns(params))
+
+    def jacobian(self, defmode, stretch, params):
+        """Returns the Jacobian matrix of size (n, p) of the Arruda-Boyce model
+        at the stretch array of size (n,) or its Kinematics in one call."""
+        return transpose(self.getjac(defmode)(kinematics(defmode, stretch), *params))
+
+    def value_and_jac(self, defmode, stretch, params):
+        """Returns the stress vector of size (n,) and the Jacobian matrix
+        of size (n, p) of the Arruda-Boyce model at the stretch array
+        of size (n,) or its Kinematics in one call."""
+        value, jac = self.getvalueandjac(defmode)(kinematics(defmode, stretch), *params)
+        return value, transpose(jac)
+
+    def hessian(self, defmode, stretch, params):
+        """Returns the Hessian matrices of size (n, p, p) of the Arruda-Boyce model
+        at the stretch array of size (n,) or its Kinematics in one call."""
+        return moveaxis(self.gethess(defmode)(kinematics(defmode, stretch), *params), -1, 0)
+
+    def weighted_hessian(self, defmode, stretch, params, weights):
+        """Returns the sum of size (p, p) of the Hessian matrices of the
+        Arruda-Boyce model at the stretch array of size (n,) or its
+        Kinematics, weighted by the array of size (n,). The Hessian
+        matrices of size (n, p, p) are not built."""
+        return self.getweightedhess(defmode)(kinematics(defmode, stretch), weights, *params)
+
     def getfunc(self, defmode):
         if defmode == 0:
             return self.ut
@@ -115,6 +203,15 @@ class ArrudaBoyce:
             return self.ps_jac
         raise NotImplementedError
 
+    def getvalueandjac(self, defmode):
+        if defmode == 0:
+            return self.ut_value_and_jac
+        if defmode == 1:
+            return self.et_value_and_jac
+        if defmode == 2:
+            return self.ps_value_and_jac
+        raise NotImplementedError
+
     def gethess(self, defmode):
         if defmode == 0:
             return self.ut_hess
@@ -124,44 +221,71 @@ class ArrudaBoyce:
             return self.ps_hess
         raise NotImplementedError
 
+    def getweightedhess(self, defmode):
+        if defmode == 0:
+            return self.ut_weighted_hess
+        if defmode == 1:
+            return self.et_weighted_hess
+        if defmode == 2:
+            return self.ps_weighted_hess
+        raise NotImplementedError
+
     def ut(self, stretch, mu, lambda_lock):
         """Represents the Arruda-Boyce model to uniaxial tension."""
-        return self.f(stretch, 1, self.lambda_chain_ut(stretch), mu, lambda_lock)
+        return self.f(kinematics(0, stretch), 1, mu, lambda_lock)
 
     def et(self, stretch, mu, lambda_lock):
         """Represents the Arruda-Boyce model to equibiaxial tension."""
-        return self.f(stretch, 4, self.lambda_chain_et(stretch), mu, lambda_lock)
+        return self.f(kinematics(1, stretch), 4, mu, lambda_lock)
 
     def ps(self, stretch, mu, lambda_lock):
         """Represents the Arruda-Boyce model to pure shear."""
-        return self.f(stretch, 2, self.lambda_chain_ps(stretch), mu, lambda_lock)
+        return self.f(kinematics(2, stretch), 2, mu, lambda_lock)
 
     def ut_jac(self, stretch, mu, lambda_lock):
         """Returns the gradient vector of the Arruda-Boyce model to uniaxial tension."""
-        return self.jac(stretch, 1, self.lambda_chain_ut(stretch), mu, lambda_lock)
+        return self.jac(kinematics(0, stretch), 1, mu, lambda_lock)
 
     def et_jac(self, stretch, mu, lambda_lock):
         """Returns the gradient vector of the Arruda-Boyce model to equibiaxial tension."""
-        return self.jac(stretch, 4, self.lambda_chain_et(stretch), mu, lambda_lock)
+        return self.jac(kinematics(1, stretch), 4, mu, lambda_lock)
 
     def ps_jac(self, stretch, mu, lambda_lock):
         """Returns the gradient vector of the Arruda-Boyce model to pure shear."""
-        return self.jac(stretch, 2, self.lambda_chain_ps(stretch), mu, lambda_lock)
+        return self.jac(kinematics(2, stretch), 2, mu, lambda_lock)
+
+    def ut_value_and_jac(self, stretch, mu, lambda_lock):
+        """Returns the stress and the gradient vector of the Arruda-Boyce model to uniaxial tension."""
+        return self.f_and_jac(kinematics(0, stretch), 1, mu, lambda_lock)
+
+    def et_value_and_jac(self, stretch, mu, lambda_lock):
+        """Returns the stress and the gradient vector of the Arruda-Boyce model to equibiaxial tension."""
+        return self.f_and_jac(kinematics(1, stretch), 4, mu, lambda_lock)
+
+    def ps_value_and_jac(self, stretch, mu, lambda_lock):
+        """Returns the stress and the gradient vector of the Arruda-Boyce model to pure shear."""
+        return self.f_and_jac(kinematics(2, stretch), 2, mu, lambda_lock)
 
     def ut_hess(self, stretch, mu, lambda_lock):
         """Returns the Hessian matrix of the Arruda-Boyce model to uniaxial tension."""
-        raise NotImplementedError
-        z = zeros((3, 3))
-        return z
+        return self.hess(kinematics(0, stretch), 1, mu, lambda_lock)
 
     def et_hess(self, stretch, mu, lambda_lock):
         """Returns the Hessian matrix of the Arruda-Boyce model to equibiaxial tension."""
-        raise NotImplementedError
-        return zeros((3, 3))
+        return self.hess(kinematics(1, stretch), 4, mu, lambda_lock)
 
     def ps_hess(self, stretch, mu, lambda_lock):
         """Returns the Hessian matrix of the Arruda-Boyce model to pure shear."""
-        raise NotImplementedError
-        return zeros((3, 3))
+        return self.hess(kinematics(2, stretch), 2, mu, lambda_lock)
+
+    def ut_weighted_hess(self, stretch, weights, mu, lambda_lock):
+        """Returns the weighted sum of the Hessian matrices of the Arruda-Boyce model to uniaxial tension."""
+        return self.weighted_hess(kinematics(0, stretch), 1, weights, mu, lambda_lock)
 
+    def et_weighted_hess(self, stretch, weights, mu, lambda_lock):
+        """Returns the weighted sum of the Hessian matrices of the Arruda-Boyce model to equibiaxial tension."""
+        return self.weighted_hess(kinematics(1, stretch), 4, weights, mu, lambda_lock)
 
+    def ps_weighted_hess(self, stretch, weights, mu, lambda_lock):
+        """Returns the weighted sum of the Hessian matrices of the Arruda-Boyce model to pure shear."""
+        return self.weighted_hess(kinematics(2, stretch), 2, weights, mu, lambda_lock)
\ No newline at end of file
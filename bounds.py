@@ -0,0 +1,37 @@
+from numpy import asarray, float64, flatnonzero, inf
+from scipy.optimize import Bounds
+
+def sign_bounds(constraint_matrix, paramcount):
+    """Re-expresses the sign constraints among the linear constraints
+    A x >= 0 as bounds of the parameters. A row with a single non-zero
+    entry constrains the sign of one parameter, x_i >= 0 if the entry
+    is positive and x_i <= 0 if it is negative.
+    ----------
+    Keyword arguments:
+    constraint_matrix -- The matrix A of the linear constraints or
+                         None if the constraint is nonlinear.
+    paramcount -- The number of parameters.
+    ----------
+    Returns:
+    The Bounds of the parameters and the list of the remaining rows
+    of A, which is empty if every constraint is a bound.
+    """
+    lower = [-inf] * paramcount
+    upper = [inf] * paramcount
+    rows = []
+    if constraint_matrix is not None:
+        for row in asarray(constraint_matrix, dtype=float64):
+            index = flatnonzero(row)
+            if len(index) != 1:
+                rows.append(row)
+            elif row[index[0]] > 0:
+                lower[index[0]] = max(lower[index[0]], 0.0)
+            else:
+                upper[index[0]] = min(upper[index[0]], 0.0)
+    return Bounds(lower, upper), rows
+
+def only_bounds(constraint_matrix, paramcount):
+    """Returns True if the constraints of a model are all sign
+    constraints, which bound-constrained methods can enforce."""
+    return constraint_matrix is not None and \
+        len(sign_bounds(constraint_matrix, paramcount)[1]) == 0
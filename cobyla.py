@@ -1,4 +1,5 @@
-from scipy.optimize import minimize
+from numpy import inf
+from scipy.optimize import minimize, LinearConstraint
 
 class Cobyla:
     name = "COBYLA"
@@ -16,6 +17,8 @@ Maximum iterations: {2}
 Catol: {3}""".format(self.tol, self.rhobeg, self.maxiter, self.catol)
 
     def get_constraint(self):
+        if self.constraint_matrix is not None:
+            return LinearConstraint(self.constraint_matrix, 0, inf)
         return {'type': 'ineq', 'fun': self.constraint}
 
     def minimize(self, callback):
@@ -1,27 +1,24 @@
-from numpy import power
+from numpy import asarray, dot
+
 class COD:
     name = "Coefficient of determination (R^2)"
     shortname = "R^2"
     name_latex = 'R^2'
 
-    def __init__(self, func, jac, hess, xdata, ydata):
-        self.func = func
-        self.fjac = jac
-        self.fhess = hess
+    def __init__(self, model, defmode, xdata, ydata):
+        self.model = model
+        self.defmode = defmode
         
-        length = len(xdata)
-        not_origin_index = [y != 0.0 for y in ydata]
-        self.data = list(zip([xdata[i] for i in range(length) if not_origin_index[i]],
-                             [ydata[i] for i in range(length) if not_origin_index[i]]))
-        self.n = len(self.data)
+        xdata, ydata = asarray(xdata), asarray(ydata)
+        not_origin_index = ydata != 0.0
+        if not not_origin_index.all():
+            xdata, ydata = xdata[not_origin_index], ydata[not_origin_index]
+        self.x, self.y = xdata, ydata
+        self.n = len(self.x)
 
-        avg = sum(y for x, y in self.data) / self.n
-        self.tot = 0.0
-        for x, y in self.data:
-            self.tot += power(y - avg, 2)
+        deviation = self.y - self.y.mean()
+        self.tot = dot(deviation, deviation)
     
     def objfunc(self, params):
-        res = 0.0
-        for x, y in self.data:
-            res += power(y - self.func(x, *params), 2)
-        return 1 - res / self.tot
+        res = self.y - self.model.values(self.defmode, self.x, params)
+        return 1 - dot(res, res) / self.tot
@@ -18,20 +18,18 @@ from stress import EngineeringStress, TrueStress
 from pdf_generator import PdfGenerator
 
 class CreateReportDialog(tk.Toplevel):
-    def __init__(self, xdatas, ydatas, model, params, plot_defmode,
+    def __init__(self, datasets, model, params, plot_defmode,
                  current_error, current_deformation, current_stress,
-                 filenames, weights, method, fit_error):
+                 weights, method, fit_error):
         tk.Toplevel.__init__(self)
         self.grab_set()
         self.title('Create report')
         self.geometry("%dx%d%+d%+d" % (400, 300, 300, 200))
 
-        self.xdatas = xdatas
-        self.ydatas = ydatas
+        self.datasets = datasets
         self.model = model
         self.params = params
-        loaded_defmode = [xdatas[i] is not None for i in range(3)]
-        self.filenames = filenames
+        loaded_defmode = [datasets[i] is not None for i in range(3)]
         self.weights = weights
         self.method = method
         self.fit_error = fit_error
@@ -122,15 +120,13 @@ class CreateReportDialog(tk.Toplevel):
         self.filename = self.entryFilename.get()
 
         pdfgen = PdfGenerator()
-        pdfgen.xdatas = self.xdatas
-        pdfgen.ydatas = self.ydatas
+        pdfgen.datasets = self.datasets
         pdfgen.model = self.model
         pdfgen.params = self.params
         pdfgen.plot_defmode = plot_defmode
         pdfgen.plot_error = error
         pdfgen.plot_deformation = deformation_quantity
         pdfgen.plot_stress = stress_quantity
-        pdfgen.filenames = self.filenames
         pdfgen.weights = self.weights
         pdfgen.method = self.method
         pdfgen.fit_error = self.fit_error
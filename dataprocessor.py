@@ -1,5 +1,9 @@
 from enum import Enum, auto
+from itertools import zip_longest, islice
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+import multiprocessing
 import csv
+import os
 import numpy as np
 from math import exp
 
@@ -9,19 +13,227 @@ from utilities import *
 
 from deformation import EngineeringStrain, Stretch, TrueStrain
 from stress import EngineeringStress, TrueStress
+from downsampling import GreedySpacing, fresh_strategy
+from dataset import Dataset, with_origin
+
+def parse_floats(strings):
+    """Converts a sequence of strings to a float64 array in one call.
+    ----------
+    Keyword arguments:
+    strings -- The strings to convert.
+    ----------
+    Returns:
+    The converted values and a boolean mask which is True where
+    the string is not a valid number. Invalid values are set to NaN.
+    """
+    try:
+        values = np.array(strings, dtype=np.float64)
+        return values, np.zeros(len(values), dtype=bool)
+    except ValueError:
+        # Fall back to converting the cells one by one.
+        parsed = [try_parse_float(s) for s in strings]
+        invalid = np.array([not isinstance(v, float) for v in parsed], dtype=bool)
+        values = np.array([np.nan if bad else v for v, bad in zip(parsed, invalid)],
+                          dtype=np.float64)
+        return values, invalid
+
+def split_rows(lines, delimiter, decimalsep):
+    """Splits the given lines into cells and replaces
+    the decimal separator with a dot."""
+    if decimalsep != '.' and decimalsep != delimiter:
+        lines = [s.replace(decimalsep, '.') for s in lines]
+    return list(csv.reader(lines, delimiter=delimiter))
+
+def cell_text(line, column, delimiter):
+    """Returns the text of the given zero-based column of a line."""
+    fields = next(csv.reader([line], delimiter=delimiter), [])
+    return fields[column] if column < len(fields) else ''
+
+def check_cells(deformation_invalid, stress_invalid, cell, first_row=1):
+    """Raises a ValueError describing the first invalid cell.
+    ----------
+    Keyword arguments:
+    deformation_invalid -- The invalid mask of the deformation column.
+    stress_invalid -- The invalid mask of the stress column.
+    cell -- A callable returning the text of the cell in the given
+            row index of the deformation (0) or stress (1) column.
+    first_row -- The number of the first row in the masks.
+    """
+    invalid = deformation_invalid | stress_invalid
+    if not invalid.any():
+        return
+    rowindex = int(np.argmax(invalid))
+    if deformation_invalid[rowindex]:
+        raise ValueError('Deformation "' + cell(rowindex, 0) + \
+            '" is not a valid number in row ' + \
+            str(first_row + rowindex) + '.')
+    raise ValueError('Stress "' + cell(rowindex, 1) + \
+        '" is not a valid number in row ' + \
+        str(first_row + rowindex) + '.')
+
+def sniff_format(lines, delimiters=';,\t|', decimalseps='.,'):
+    """Infers the format of a CSV file from its first lines.
+    Every combination of the candidate delimiters and decimal
+    separators is parsed. The one giving the most rows of numbers
+    after the header wins, then the one with the most columns.
+    ----------
+    Keyword arguments:
+    lines -- The first lines of the file.
+    delimiters -- The candidate delimiters.
+    decimalseps -- The candidate decimal separators.
+    ----------
+    Returns:
+    The delimiter, the decimal separator, the number of header rows
+    and the list of the one-based indices of the numeric columns,
+    or None if no combination gives a row of numbers.
+    """
+    best = None
+    for delimiter in delimiters:
+        for decimalsep in decimalseps:
+            if delimiter == decimalsep:
+                continue
+            rows = split_rows(lines, delimiter, decimalsep)
+            numeric = [[not isinstance(try_parse_float(c), str) for c in row] for row in rows]
+            # The header ends at the first row of numbers only.
+            header_rows = next((i for i, row in enumerate(numeric)
+                                if len(row) > 0 and all(row)), None)
+            if header_rows is None:
+                continue
+            columns = len(rows[header_rows])
+            count = sum(1 for row in numeric[header_rows:] if len(row) == columns and all(row))
+            # Prefer the decimal separator which actually occurs.
+            used = any(decimalsep in s for s in lines[header_rows:])
+            score = (count, columns, used)
+            if best is None or score > best[0]:
+                numeric_columns = [c + 1 for c in range(columns)
+                                   if all(c < len(row) and row[c] for row in numeric[header_rows:]
+                                          if len(row) > 0)]
+                best = (score, (delimiter, decimalsep, header_rows, numeric_columns))
+    return None if best is None else best[1]
+
+def convert(deformation, deformation_quantity, stress, stress_quantity):
+    """Converts whole deformation and stress columns
+    to stretch and true stress arrays."""
+    stretch = np.asarray(deformation_quantity.to_stretch(deformation), dtype=np.float64)
+    true_stress = np.asarray(stress_quantity.to_true_stress(stress, stretch), dtype=np.float64)
+    return stretch, true_stress
+
+def sort_data(stretch, true_stress):
+    """Sorts the samples by stretch. A stable sort keeps
+    samples with equal stretch in file order."""
+    order = np.argsort(stretch, kind='stable')
+    return stretch[order], true_stress[order]
 
 class DataProcessor:
-    def load_file(self, filename):
+    def __init__(self):
+        self.strategy = GreedySpacing()
+        self.partial = False
+        self.cache = None
+        self.lines = None
+        self.header_rows = 0
+        # The number of lines processed at once between two progress
+        # reports, and by stream_file.
+        self.chunk_size = 65536
+        # Called with the stage, the work done and the total work.
+        # It may raise an exception to abort the processing.
+        self.progress = None
+
+    def report(self, stage, done, total):
+        """Reports the progress to the progress callback."""
+        if self.progress is not None:
+            self.progress(stage, done, total)
+
+    def load_file(self, filename, max_lines=None):
+        """Reads the lines of the given file.
+        ----------
+        Keyword arguments:
+        filename -- The path of the file.
+        max_lines -- Read only this many lines from the beginning of
+                     the file, e.g. to preview a file which is
+                     streamed later. None reads the whole file.
+        """
+        size = os.path.getsize(filename)
+        lines = []
+        read = 0
+        with open(filename, 'r', newline='') as f:
+            while max_lines is None or len(lines) < max_lines:
+                count = 65536 if max_lines is None else min(65536, max_lines - len(lines))
+                chunk = list(islice(f, count))
+                if not chunk:
+                    break
+                # The characters read approximate the bytes read.
+                read += sum(map(len, chunk))
+                lines.extend(s.strip() for s in chunk)
+                self.report('Reading', min(read, size), size)
+            self.partial = max_lines is not None and f.readline() != ''
+        self.lines = lines
+        self.filename = filename
+
+    def load_prefix(self, filename, size=8192):
+        """Reads the complete lines of the first size characters
+        of the given file, e.g. to sniff its format and preview it."""
         with open(filename, 'r', newline='') as f:
-            self.lines = [s.strip() for s in f.readlines()]
+            text = f.read(size)
+            self.partial = f.read(1) != ''
+        lines = text.splitlines()
+        if self.partial and len(lines) > 1:
+            # The last line may be cut.
+            lines.pop()
+        self.lines = [s.strip() for s in lines]
+        self.filename = filename
 
     def parse_csv(self, delimiter=';', decimalsep=','):
-        csvreader = csv.reader(self.lines, delimiter=delimiter)
-        self.raw = []
-        for row in csvreader:
-            self.raw.append([try_parse_float(s.replace(decimalsep, '.')) for s in row])
-        self.max_column_count = max([len(row) for row in self.raw])
-        self.min_column_count = min([len(row) for row in self.raw])
+        """Parses the loaded lines into contiguous float64 columns.
+        ----------
+        Keyword arguments:
+        delimiter -- The character separating the columns.
+        decimalsep -- The character used as decimal separator.
+        ----------
+        After parsing, values[c] holds the numbers of column c + 1 and
+        invalid[c] is True where that cell is missing or is not a number.
+        The first header_rows lines are skipped.
+        """
+        if self.lines is None:
+            self.load_file(self.filename)
+        self.delimiter = delimiter
+        self.decimalsep = decimalsep
+        lines = self.lines[self.header_rows:]
+        rows = []
+        for start in range(0, len(lines), self.chunk_size):
+            rows.extend(split_rows(lines[start:start + self.chunk_size], delimiter, decimalsep))
+            self.report('Splitting', len(rows), len(lines))
+        lengths = [len(row) for row in rows]
+        self.max_column_count = max(lengths, default=0)
+        self.min_column_count = min(lengths, default=0)
+        self.values = np.empty((self.max_column_count, len(rows)))
+        self.invalid = np.empty((self.max_column_count, len(rows)), dtype=bool)
+        for c, column in enumerate(zip_longest(*rows, fillvalue='')):
+            self.values[c], self.invalid[c] = parse_floats(column)
+            self.report('Parsing', c + 1, self.max_column_count)
+
+    def cell(self, row, column):
+        """Returns the text of the given cell as it appears in the file.
+        ----------
+        Keyword arguments:
+        row -- The zero-based index of the row.
+        column -- The zero-based index of the column.
+        """
+        return cell_text(self.lines[self.header_rows + row], column, self.delimiter)
+
+    def rows(self, max_rows=None):
+        """Yields the parsed rows. Invalid cells are yielded
+        with their original text.
+        ----------
+        Keyword arguments:
+        max_rows -- The number of rows yielded from the beginning,
+                    all of them if None.
+        """
+        for i, row in enumerate(self.values[:, :max_rows].T.tolist()):
+            invalid = self.invalid[:, i]
+            if invalid.any():
+                yield [self.cell(i, c) if invalid[c] else value for c, value in enumerate(row)]
+            else:
+                yield row
 
     def define_data(self,
                  deformation_quantity=Stretch,
@@ -42,45 +254,318 @@ class DataProcessor:
                 str(stress_column) + ' is out of range. ' + \
                 'Number of full columns is ' + \
                 str(self.min_column_count) + '.')
-        self.stretch, self.true_stress = [], []
-        rowindex = 0
-        for row in self.raw:
-            rowindex += 1
-            deformation = row[deformation_column - 1]
-            stress = row[stress_column - 1]
-            if not isinstance(deformation, float):
-                raise ValueError('Deformation "' + deformation + \
-                    '" is not a valid number in row ' + \
-                    str(rowindex) + '.')
-                return
-            if not isinstance(stress, float):
-                raise ValueError('Stress "' + stress + \
-                    '" is not a valid number in row ' + \
-                    str(rowindex) + '.')
-                return
-            stretch = deformation_quantity.to_stretch(deformation)
-            true_stress = stress_quantity.to_true_stress(stress, stretch)
-            self.stretch.append(stretch)
-            self.true_stress.append(true_stress)
-            combined = [pair for pair in zip(self.stretch, self.true_stress)]
-            combined.sort(key=lambda pair : pair[0])
-            self.stretch = [pair[0] for pair in combined]
-            self.true_stress = [pair[1] for pair in combined]
+        deformation_index = deformation_column - 1
+        stress_index = stress_column - 1
+        columns = [deformation_index, stress_index]
+        check_cells(self.invalid[deformation_index], self.invalid[stress_index],
+                    lambda row, which: self.cell(row, columns[which]),
+                    self.header_rows + 1)
+        deformation = self.values[deformation_index]
+        stress = self.values[stress_index]
+        n = len(deformation)
+        stretch = np.empty(n)
+        true_stress = np.empty(n)
+        # Convert block by block, so that the progress is reported
+        # and the processing can be cancelled.
+        for start in range(0, n, self.chunk_size):
+            end = min(start + self.chunk_size, n)
+            stretch[start:end], true_stress[start:end] = convert(
+                deformation[start:end], deformation_quantity,
+                stress[start:end], stress_quantity)
+            self.report('Converting', end, n)
+        self.report('Sorting', 0, 1)
+        self.stretch, self.true_stress = sort_data(stretch, true_stress)
+        self.report('Sorting', 1, 1)
+        self.set_options(self.delimiter, self.decimalsep, deformation_quantity,
+                         deformation_column, stress_quantity, stress_column)
+
+    def set_options(self, delimiter, decimalsep, deformation_quantity,
+                    deformation_column, stress_quantity, stress_column):
+        """Saves the options the data is processed with."""
+        self.delimiter = delimiter
+        self.decimalsep = decimalsep
+        self.deformation_quantity = deformation_quantity
+        self.deformation_column = deformation_column
+        self.stress_quantity = stress_quantity
+        self.stress_column = stress_column
 
     def limit_data(self, samples):
-        self.stretch_limited, self.true_stress_limited = self.stretch.copy(), self.true_stress.copy()
-        if (samples > 2):
-            while len(self.stretch_limited) > samples:
-                distances = [self.stretch_limited[i + 2] - self.stretch_limited[i] \
-                    for i in range(len(self.stretch_limited) - 3)]
-                minindex = distances.index(min(distances)) + 1
-                del self.stretch_limited[minindex]
-                del self.true_stress_limited[minindex]
-        elif samples == 2:
-            # Keep the first and the last samples.
-            self.stretch_limited = [self.stretch_limited[0], self.stretch_limited[-1]]
-            self.true_stress_limited = [self.true_stress_limited[0], self.true_stress_limited[-1]]
-        elif samples == 1:
-            # Keep the last sample.
-            self.stretch_limited = [self.stretch_limited[-1]]
-            self.true_stress_limited = [self.true_stress_limited[-1]]
+        """Reduces the data with the selected downsampling strategy.
+        ----------
+        Keyword arguments:
+        samples -- The number of samples to keep. Every sample
+                   is kept if it is not positive.
+        """
+        self.report('Downsampling', 0, 1)
+        greedy = isinstance(self.strategy, GreedySpacing)
+        if greedy:
+            self.strategy.progress = lambda done, total: \
+                self.report('Downsampling', done, total)
+        try:
+            self.stretch_limited, self.true_stress_limited = \
+                self.strategy.limit(self.stretch, self.true_stress, samples)
+        finally:
+            if greedy:
+                # Keep the strategy picklable.
+                self.strategy.progress = None
+        self.samples = samples
+        self.report('Downsampling', 1, 1)
+
+    def stream_file(self, filename, samples,
+                    delimiter=';', decimalsep=',',
+                    deformation_quantity=Stretch, deformation_column=1,
+                    stress_quantity=TrueStress, stress_column=2):
+        """Loads, converts and limits a file chunk of chunk_size lines
+        by chunk. Only the current chunk and a buffer of samples are held
+        in memory. The buffer is thinned to twice the sample count by
+        greedy spacing whenever it exceeds four times the sample count,
+        so it never grows beyond that plus one chunk.
+        The selected strategy limits the final buffer, the result is
+        stored like after limit_data. The first header_rows lines
+        are skipped.
+
+        The thinning only sees the samples read so far, so the kept
+        samples depend on the chunk size and may differ from those
+        of limit_data on the whole file. The cache keys of streamed
+        files include the chunk size for this reason.
+        ----------
+        Keyword arguments:
+        filename -- The path of the file.
+        samples -- The number of samples to keep. It has to be
+                   positive, a ValueError is raised otherwise.
+        delimiter -- The character separating the columns.
+        decimalsep -- The character used as decimal separator.
+        deformation_quantity -- The quantity of the deformation column.
+        deformation_column -- The one-based index of the deformation column.
+        stress_quantity -- The quantity of the stress column.
+        stress_column -- The one-based index of the stress column.
+        """
+        if deformation_column < 1:
+            raise ValueError('Deformation column index has to be positive.')
+        if stress_column < 1:
+            raise ValueError('Stress column index has to be positive.')
+        if samples <= 0:
+            # Keeping every sample would hold the whole file in memory.
+            raise ValueError('The number of samples has to be positive ' + \
+                             'when a large file is streamed.')
+        self.set_options(delimiter, decimalsep, deformation_quantity, deformation_column,
+                         stress_quantity, stress_column)
+        self.filename = filename
+        columns = [deformation_column - 1, stress_column - 1]
+        buffer_strategy = GreedySpacing()
+        # The buffer is allocated once and doubled when a chunk does
+        # not fit, the samples are appended in place.
+        stretch, true_stress = np.empty(4 * samples), np.empty(4 * samples)
+        count = 0
+        first_row = self.header_rows + 1
+        size = os.path.getsize(filename)
+        read = 0
+        with open(filename, 'r', newline='') as f:
+            for line in islice(f, self.header_rows):
+                pass
+            while True:
+                lines = list(islice(f, self.chunk_size))
+                if not lines:
+                    break
+                read += sum(map(len, lines))
+                lines = [s.strip() for s in lines]
+                rows = split_rows(lines, delimiter, decimalsep)
+                cells = [[row[c] if c < len(row) else '' for row in rows] for c in columns]
+                (deformation, deformation_invalid), (stress, stress_invalid) = \
+                    [parse_floats(column) for column in cells]
+                check_cells(deformation_invalid, stress_invalid,
+                            lambda row, which: cell_text(lines[row], columns[which], delimiter),
+                            first_row)
+                chunk_stretch, chunk_true_stress = convert(deformation, deformation_quantity,
+                                                           stress, stress_quantity)
+                end = count + len(chunk_stretch)
+                if end > len(stretch):
+                    capacity = max(2 * len(stretch), end)
+                    stretch, old_stretch = np.empty(capacity), stretch
+                    true_stress, old_true_stress = np.empty(capacity), true_stress
+                    stretch[:count] = old_stretch[:count]
+                    true_stress[:count] = old_true_stress[:count]
+                stretch[count:end] = chunk_stretch
+                true_stress[count:end] = chunk_true_stress
+                count = end
+                if count > 4 * samples:
+                    kept_stretch, kept_true_stress = buffer_strategy.limit(
+                        *sort_data(stretch[:count], true_stress[:count]), 2 * samples)
+                    count = len(kept_stretch)
+                    stretch[:count] = kept_stretch
+                    true_stress[:count] = kept_true_stress
+                first_row += len(lines)
+                self.report('Streaming', min(read, size), size)
+        self.stretch, self.true_stress = sort_data(stretch[:count], true_stress[:count])
+        self.limit_data(samples)
+
+    def cache_key(self, filename, samples, streamed=False):
+        """Returns the cache key of the file processed
+        with the saved options and the given sample count.
+        Streamed files are keyed by the chunk size too."""
+        options = [self.delimiter, self.decimalsep, self.header_rows,
+                   self.deformation_quantity.name, self.deformation_column,
+                   self.stress_quantity.name, self.stress_column,
+                   samples, self.strategy.name,
+                   getattr(self.strategy, 'tolerance', None),
+                   self.chunk_size if streamed else None]
+        return self.cache.key(filename, options)
+
+    def load_cached(self, filename, samples, streamed=False):
+        """Loads the limited data from the cache if it holds the file
+        processed with the saved options and the given sample count.
+        Whether the file is streamed selects the entry, see stream_file.
+        ----------
+        Returns:
+        True if the data was found in the cache.
+        """
+        if self.cache is None:
+            return False
+        cached = self.cache.load(filename, self.cache_key(filename, samples, streamed))
+        if cached is None:
+            return False
+        self.stretch, self.true_stress = cached
+        self.stretch_limited, self.true_stress_limited = cached
+        self.samples = samples
+        return True
+
+    def store_cached(self, filename, samples, streamed=False):
+        """Stores the limited data in the cache."""
+        if self.cache is None:
+            return
+        self.cache.store(filename, self.cache_key(filename, samples, streamed),
+                         self.stretch_limited, self.true_stress_limited)
+
+    def process_file(self, filename, samples,
+                     delimiter=';', decimalsep=',',
+                     deformation_quantity=Stretch, deformation_column=1,
+                     stress_quantity=TrueStress, stress_column=2,
+                     streaming_size=64 * 1024 * 1024):
+        """Loads, converts and limits a file in one go, or takes
+        the result from the cache. Files larger than streaming_size
+        bytes are streamed. The keyword arguments are the same
+        as of stream_file."""
+        self.set_options(delimiter, decimalsep, deformation_quantity,
+                         deformation_column, stress_quantity, stress_column)
+        self.filename = filename
+        streamed = os.path.getsize(filename) > streaming_size
+        if self.load_cached(filename, samples, streamed):
+            return
+        if streamed:
+            self.stream_file(filename, samples, delimiter, decimalsep,
+                             deformation_quantity, deformation_column,
+                             stress_quantity, stress_column)
+        else:
+            self.load_file(filename)
+            self.parse_csv(delimiter, decimalsep)
+            self.define_data(deformation_quantity, deformation_column,
+                             stress_quantity, stress_column)
+            self.release()
+            self.limit_data(samples)
+        self.store_cached(filename, samples, streamed)
+
+    def release(self):
+        """Frees the text lines and the parsed table. The file
+        is read again if it has to be parsed once more."""
+        self.lines = None
+        self.values = None
+        self.invalid = None
+
+    def create_dataset(self):
+        """Returns the limited data as a Dataset including the
+        undeformed state and releases the parsed table."""
+        stretch, true_stress = with_origin(self.stretch_limited, self.true_stress_limited)
+        options = {'delimiter': self.delimiter,
+                   'decimalsep': self.decimalsep,
+                   'header_rows': self.header_rows,
+                   'deformation_quantity': self.deformation_quantity.name,
+                   'deformation_column': self.deformation_column,
+                   'stress_quantity': self.stress_quantity.name,
+                   'stress_column': self.stress_column,
+                   'samples': self.samples,
+                   'strategy': self.strategy.name}
+        self.release()
+        return Dataset(stretch, true_stress, self.filename, options)
+
+def find_mode_files(directory):
+    """Returns the dictionary of deformation mode ('UT', 'ET', 'PS')
+    to the ut.csv, et.csv and ps.csv files found in the directory."""
+    files = {}
+    for defmode in ['UT', 'ET', 'PS']:
+        filename = os.path.join(directory, defmode.lower() + '.csv')
+        if os.path.isfile(filename):
+            files[defmode] = filename
+    return files
+
+def load_dataset(filename, samples, delimiter=';', decimalsep=',',
+                 deformation_quantity=Stretch, deformation_column=1,
+                 stress_quantity=TrueStress, stress_column=2,
+                 strategy=None, cache=None, header_rows=0, progress=None):
+    """Processes a whole file with a new DataProcessor and returns
+    the Dataset. The keyword arguments are the same as of
+    DataProcessor.stream_file, strategy, cache, header_rows
+    and progress are those of the DataProcessor."""
+    processor = DataProcessor()
+    processor.header_rows = header_rows
+    processor.progress = progress
+    if strategy is not None:
+        processor.strategy = strategy
+    processor.cache = cache
+    processor.process_file(filename, samples, delimiter, decimalsep,
+                           deformation_quantity, deformation_column,
+                           stress_quantity, stress_column)
+    return processor.create_dataset()
+
+def load_files(files, samples, delimiter=';', decimalsep=',',
+               deformation_quantity=Stretch, deformation_column=1,
+               stress_quantity=TrueStress, stress_column=2,
+               strategy=None, cache=None, header_rows=0, processes=True,
+               progress=None):
+    """Processes the files of several deformation modes concurrently.
+    ----------
+    Keyword arguments:
+    files -- The dictionary of deformation mode to file name,
+             e.g. the result of find_mode_files.
+    processes -- Whether to use a process pool. Parsing mostly holds
+                 the interpreter lock, so threads only overlap I/O.
+    progress -- Called with the stage, the number of files done and
+                the number of files whenever a file is done and every
+                tenth of a second while waiting. It may raise an
+                exception to abort, the files not started yet are
+                cancelled.
+    The other keyword arguments are the same as of load_dataset,
+    they apply to every file. Every file is limited by a fresh
+    instance of the strategy, so nothing the given instance cached
+    is shared or sent to the processes.
+    ----------
+    Returns:
+    The dictionary of deformation mode to Dataset. The first error
+    raised while processing a file is raised again.
+    """
+    workers = max(len(files), 1)
+    if processes:
+        # This runs in a worker thread of the Tk application. A forked
+        # process would inherit the locks held by the other threads,
+        # spawned processes start from a clean interpreter.
+        executor = ProcessPoolExecutor(max_workers=workers,
+                                       mp_context=multiprocessing.get_context('spawn'))
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = {defmode: executor.submit(load_dataset, filename, samples,
+                                            delimiter, decimalsep,
+                                            deformation_quantity, deformation_column,
+                                            stress_quantity, stress_column,
+                                            None if strategy is None else fresh_strategy(strategy),
+                                            cache, header_rows)
+                   for defmode, filename in files.items()}
+        pending = set(futures.values())
+        while pending:
+            finished, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in finished:
+                future.result()
+            if progress is not None:
+                progress('Loading files', len(futures) - len(pending), len(futures))
+        return {defmode: future.result() for defmode, future in futures.items()}
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,79 @@
+import numpy as np
+from kinematics import Kinematics
+
+class Dataset:
+    """Immutable stretch and true stress data of one deformation mode.
+    The arrays are read-only, so the same instance can be shared by
+    the dialogs, the error functions and the report without copying."""
+    __slots__ = ('stretch', 'stress', 'origin', 'fit_stretch', 'fit_stress',
+                 'filename', 'options', 'kinematics_cache')
+
+    def __init__(self, stretch, stress, filename=None, options=None):
+        """Initializes a Dataset instance.
+        ----------
+        Keyword arguments:
+        stretch -- The stretch values of size (n,).
+        stress -- The true stress values of size (n,).
+        filename -- The path of the file the data was loaded from.
+        options -- The dictionary of options the data was processed with.
+        """
+        stretch = readonly(stretch)
+        stress = readonly(stress)
+        if stretch.shape != stress.shape:
+            raise ValueError('Stretch and stress must have the same length.')
+        origin = readonly(stretch == 1.0)
+        if origin.any():
+            fit_stretch, fit_stress = readonly(stretch[~origin]), readonly(stress[~origin])
+        else:
+            fit_stretch, fit_stress = stretch, stress
+        set_slot = object.__setattr__
+        set_slot(self, 'stretch', stretch)
+        set_slot(self, 'stress', stress)
+        set_slot(self, 'origin', origin)
+        set_slot(self, 'fit_stretch', fit_stretch)
+        set_slot(self, 'fit_stress', fit_stress)
+        set_slot(self, 'filename', filename)
+        set_slot(self, 'options', dict(options or {}))
+        set_slot(self, 'kinematics_cache', {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Dataset is immutable.')
+
+    def __delattr__(self, name):
+        raise AttributeError('Dataset is immutable.')
+
+    def __reduce__(self):
+        return (Dataset, (self.stretch, self.stress, self.filename, self.options))
+
+    def __len__(self):
+        return len(self.stretch)
+
+    def kinematics(self, defmode):
+        """Returns the Kinematics of the fitted stretch values in the
+        given deformation mode. They are calculated once per dataset,
+        so the fits of different models and methods share them."""
+        kinematics = self.kinematics_cache.get(defmode)
+        if kinematics is None:
+            kinematics = Kinematics(defmode, self.fit_stretch)
+            self.kinematics_cache[defmode] = kinematics
+        return kinematics
+
+def readonly(array):
+    """Returns the given array as a read-only float or boolean
+    NumPy array, without copying when possible."""
+    array = np.asarray(array)
+    if array.dtype != np.bool_:
+        array = np.asarray(array, dtype=np.float64)
+    if array.flags.writeable:
+        # Make a read-only view, the caller's array stays writeable.
+        array = array.view()
+        array.setflags(write=False)
+    return array
+
+def with_origin(stretch, stress):
+    """Inserts the undeformed state (stretch 1, stress 0) into the
+    sorted data if it is missing."""
+    if (stretch == 1.0).any():
+        return stretch, stress
+    index = np.searchsorted(stretch, 1.0)
+    return np.insert(stretch, index, 1.0), np.insert(stress, index, 0.0)
@@ -0,0 +1,97 @@
+import hashlib
+import os
+import numpy as np
+
+class DatasetCache:
+    """Stores processed stretch and true stress arrays in a sidecar
+    directory next to the data files. Entries are keyed by the hash
+    of the file content and the processing options, so editing the
+    file or changing any option misses the cache."""
+
+    def __init__(self, dirname='.hypercalib_cache', max_entries=64,
+                 max_bytes=256 * 1024 * 1024):
+        """Initializes a DatasetCache instance.
+        ----------
+        Keyword arguments:
+        dirname -- The name of the cache directory created
+                   next to the data files.
+        max_entries -- The number of entries kept per directory.
+        max_bytes -- The total size of the entries kept per directory.
+        """
+        self.dirname = dirname
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def key(self, filename, options):
+        """Returns the cache key of the given file and options.
+        ----------
+        Keyword arguments:
+        filename -- The path of the data file.
+        options -- The list of options the data is processed with.
+                   Their repr must identify them.
+        """
+        digest = hashlib.sha256()
+        with open(filename, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        digest.update(repr(options).encode('utf-8'))
+        return digest.hexdigest()
+
+    def directory(self, filename):
+        """Returns the cache directory of the given data file."""
+        return os.path.join(os.path.dirname(os.path.abspath(filename)), self.dirname)
+
+    def load(self, filename, key):
+        """Returns the cached stretch and true stress arrays or None.
+        The arrays are read-only views of a memory-mapped file."""
+        path = os.path.join(self.directory(filename), key + '.npy')
+        try:
+            data = np.load(path, mmap_mode='r')
+            # Mark the entry as recently used.
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return data[0], data[1]
+
+    def store(self, filename, key, stretch, true_stress):
+        """Stores the given arrays and evicts the least recently
+        used entries above the size limits."""
+        directory = self.directory(filename)
+        path = os.path.join(directory, key + '.npy')
+        try:
+            os.makedirs(directory, exist_ok=True)
+            # Write to a temporary file first so that a reader
+            # never sees a partially written entry.
+            with open(path + '.tmp', 'wb') as f:
+                np.save(f, np.array([stretch, true_stress], dtype=np.float64))
+            os.replace(path + '.tmp', path)
+        except OSError:
+            return
+        self.evict(directory)
+
+    def evict(self, directory):
+        """Removes the least recently used entries of the directory
+        until it fits into the size limits."""
+        entries = []
+        for name in os.listdir(directory):
+            if not name.endswith('.npy'):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        total = sum(size for mtime, size, path in entries)
+        count = len(entries)
+        for mtime, size, path in entries:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                # The entry may be mapped by a reader.
+                continue
+            count -= 1
+            total -= size
@@ -0,0 +1,205 @@
+from heapq import heapify, heappush, heappop
+import numpy as np
+
+def removal_order(stretch, progress=None):
+    """Ranks the samples in the order GreedySpacing removes them.
+    The sample whose neighbours are the closest to each other is removed
+    first, ties are removed from the left. The first and the last two
+    samples are never removed.
+    ----------
+    Keyword arguments:
+    stretch -- The sorted stretch values of the samples.
+    progress -- Called with the number of samples ranked so far
+                and the number of removable samples now and then.
+    ----------
+    Returns:
+    The indices of the removable samples in removal order.
+    """
+    x = np.asarray(stretch).tolist()
+    n = len(x)
+    prev = list(range(-1, n - 1))
+    succ = list(range(1, n + 1))
+    removed = [False] * n
+    heap = [(x[i + 1] - x[i - 1], i) for i in range(1, n - 2)]
+    heapify(heap)
+    order = []
+    while heap:
+        distance, i = heappop(heap)
+        # Skip entries made stale by the removal of a neighbour.
+        if removed[i] or distance != x[succ[i]] - x[prev[i]]:
+            continue
+        removed[i] = True
+        order.append(i)
+        if progress is not None and len(order) % 16384 == 0:
+            progress(len(order), n - 3)
+        p, q = prev[i], succ[i]
+        succ[p], prev[q] = q, p
+        if p > 0:
+            heappush(heap, (x[q] - x[prev[p]], p))
+        if q < n - 2:
+            heappush(heap, (x[succ[q]] - x[p], q))
+    return np.array(order, dtype=np.intp)
+
+def bin_means(stretch, stress, bins):
+    """Averages the samples falling into the same bin.
+    ----------
+    Keyword arguments:
+    stretch -- The sorted stretch values of the samples.
+    stress -- The true stress values of the samples.
+    bins -- The non-decreasing bin index of every sample.
+    ----------
+    Returns:
+    The mean stretch and mean stress of the non-empty bins.
+    """
+    counts = np.bincount(bins)
+    nonempty = counts > 0
+    counts = counts[nonempty]
+    return np.bincount(bins, stretch)[nonempty] / counts, \
+           np.bincount(bins, stress)[nonempty] / counts
+
+def trivial_limit(stretch, stress, samples):
+    """Handles the sample counts where no strategy has a choice.
+    ----------
+    Returns:
+    The limited stretch and stress arrays or None if there is
+    more than the first and the last sample to choose from.
+    """
+    n = len(stretch)
+    if samples <= 0 or samples >= n:
+        return stretch, stress
+    if samples == 2:
+        # Keep the first and the last samples.
+        return stretch[[0, n - 1]], stress[[0, n - 1]]
+    if samples == 1:
+        # Keep the last sample.
+        return stretch[[n - 1]], stress[[n - 1]]
+    return None
+
+class GreedySpacing:
+    """Repeatedly removes the sample whose neighbours are
+    the closest to each other."""
+    name = 'Greedy spacing'
+
+    def __init__(self):
+        self.stretch = None
+        self.order = None
+        self.progress = None
+
+    def limit(self, stretch, stress, samples):
+        """Returns the limited stretch and stress arrays.
+        The removal ranking is calculated once per data,
+        other sample counts only slice it."""
+        limited = trivial_limit(stretch, stress, samples)
+        if limited is not None:
+            return limited
+        if stretch is not self.stretch:
+            self.order = removal_order(stretch, self.progress)
+            self.stretch = stretch
+        keep = np.ones(len(stretch), dtype=bool)
+        keep[self.order[:len(stretch) - samples]] = False
+        return stretch[keep], stress[keep]
+
+class LargestTriangleThreeBuckets:
+    """Keeps the sample of every bucket which forms the largest
+    triangle with the previously kept sample and the average
+    of the next bucket. Peaks and bends of the curve are kept."""
+    name = 'Largest triangle three buckets'
+
+    def limit(self, stretch, stress, samples):
+        """Returns the limited stretch and stress arrays."""
+        limited = trivial_limit(stretch, stress, samples)
+        if limited is not None:
+            return limited
+        n = len(stretch)
+        # The inner samples are split into samples - 2 buckets.
+        edges = np.floor(np.linspace(1, n - 1, samples - 1)).astype(np.intp)
+        edges = np.append(edges, n)
+        keep = np.empty(samples, dtype=np.intp)
+        keep[0], keep[-1] = 0, n - 1
+        a = 0
+        for k in range(samples - 2):
+            lo, hi = edges[k], edges[k + 1]
+            next_x = stretch[hi:edges[k + 2]].mean()
+            next_y = stress[hi:edges[k + 2]].mean()
+            area = np.abs((stretch[a] - next_x) * (stress[lo:hi] - stress[a]) -
+                          (stretch[a] - stretch[lo:hi]) * (next_y - stress[a]))
+            a = lo + int(np.argmax(area))
+            keep[k + 1] = a
+        return stretch[keep], stress[keep]
+
+class UniformStretch:
+    """Resamples the curve at evenly spaced stretch values
+    by linear interpolation. Samples with the same stretch
+    are averaged first."""
+    name = 'Uniform stretch resampling'
+
+    def limit(self, stretch, stress, samples):
+        """Returns the resampled stretch and stress arrays."""
+        limited = trivial_limit(stretch, stress, samples)
+        if limited is not None:
+            return limited
+        unique, inverse = np.unique(stretch, return_inverse=True)
+        unique, mean_stress = bin_means(stretch, stress, inverse)
+        resampled = np.linspace(stretch[0], stretch[-1], samples)
+        return resampled, np.interp(resampled, unique, mean_stress)
+
+class StretchBinning:
+    """Averages the samples of equally wide stretch bins, which
+    merges repeated and cyclic (loading-unloading) measurements.
+    Without a sample count, samples with the same stretch
+    are averaged."""
+    name = 'Stretch binning'
+
+    def limit(self, stretch, stress, samples):
+        """Returns the mean stretch and stress of the non-empty bins."""
+        if samples <= 0:
+            bins = np.unique(stretch, return_inverse=True)[1]
+            return bin_means(stretch, stress, bins)
+        width = (stretch[-1] - stretch[0]) / samples
+        if width == 0.0:
+            bins = np.zeros(len(stretch), dtype=np.intp)
+        else:
+            bins = np.minimum(((stretch - stretch[0]) / width).astype(np.intp), samples - 1)
+        return bin_means(stretch, stress, bins)
+
+class ErrorBounded:
+    """Keeps only the samples needed to reproduce every sample
+    by linear interpolation within the given stress tolerance
+    (Ramer-Douglas-Peucker with vertical distance). The sample
+    count is ignored."""
+    name = 'Error-bounded'
+
+    def __init__(self):
+        self.tolerance = 0.0
+
+    def limit(self, stretch, stress, samples):
+        """Returns the limited stretch and stress arrays."""
+        n = len(stretch)
+        if n < 3:
+            return stretch, stress
+        index = np.arange(n)
+        keep = np.array([0, n - 1])
+        while True:
+            # Interpolate every sample between the kept samples
+            # around it. All segments are refined at once.
+            segment = np.minimum(np.searchsorted(keep, index, side='right') - 1, len(keep) - 2)
+            left, right = keep[segment], keep[segment + 1]
+            dx = stretch[right] - stretch[left]
+            t = np.divide(stretch - stretch[left], dx, out=np.zeros(n), where=dx != 0)
+            deviation = np.abs(stress - stress[left] - t * (stress[right] - stress[left]))
+            deviation[keep] = 0.0
+            worst = np.maximum.reduceat(deviation, keep[:-1])
+            candidates = (deviation == worst[segment]) & (deviation > self.tolerance)
+            if not candidates.any():
+                return stretch[keep], stress[keep]
+            # Split every segment at its first worst sample.
+            first = np.unique(segment[candidates], return_index=True)[1]
+            keep = np.union1d(keep, index[candidates][first])
+
+def fresh_strategy(strategy):
+    """Returns a new instance of the given strategy with the same
+    settings, but without anything it cached from other data."""
+    fresh = type(strategy)()
+    if isinstance(strategy, ErrorBounded):
+        fresh.tolerance = strategy.tolerance
+    return fresh
@@ -0,0 +1,63 @@
+from collections import OrderedDict
+from numpy import asarray, float64
+
+class EvaluationCache:
+    """Remembers the quantities computed at the last few parameter
+    vectors, so that the objective function, the gradient and the
+    Hessian evaluated at the same point share the residuals and
+    the model derivatives."""
+
+    def __init__(self, size=4):
+        """Initializes an EvaluationCache instance.
+        ----------
+        Keyword arguments:
+        size -- The number of parameter vectors remembered.
+        """
+        self.size = size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, params, name, compute):
+        """Returns the named quantity at the given parameters.
+        ----------
+        Keyword arguments:
+        params -- The parameter vector.
+        name -- The name of the quantity.
+        compute -- A callable without arguments calculating the
+                   quantity if it is not cached yet. The returned
+                   value must not be modified by the caller.
+        """
+        entry = self.entry(params)
+        if name in entry:
+            self.hits += 1
+            return entry[name]
+        self.misses += 1
+        value = compute()
+        entry[name] = value
+        return value
+
+    def put(self, params, name, value):
+        """Stores the named quantity at the given parameters, which
+        was calculated together with another one."""
+        self.entry(params)[name] = value
+
+    def entry(self, params):
+        """Returns the dictionary of the quantities cached at the
+        given parameters and marks it as recently used."""
+        key = asarray(params, dtype=float64).tobytes()
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = {}
+            self.entries[key] = entry
+            if len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+        else:
+            self.entries.move_to_end(key)
+        return entry
+
+    def clear(self):
+        """Forgets every cached quantity and resets the counters."""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -1,4 +1,5 @@
 import os
+import queue
 import numpy as np
 import matplotlib
 matplotlib.use("Agg")
@@ -12,9 +13,13 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 
 from utilities import *
-from dataprocessor import DataProcessor
+from dataprocessor import DataProcessor, find_mode_files, load_files, sniff_format
+from dataset_cache import DatasetCache
+from worker import Worker
 from deformation import EngineeringStrain, Stretch, TrueStrain
 from stress import EngineeringStress, TrueStress
+from downsampling import GreedySpacing, LargestTriangleThreeBuckets, \
+    UniformStretch, StretchBinning, ErrorBounded
 
 class FileDialog(tk.Toplevel):
     def __init__(self, callback):
@@ -30,10 +35,40 @@ class FileDialog(tk.Toplevel):
         self.callback = callback
 
         self.processor = DataProcessor()
+        self.processor.cache = DatasetCache()
+        # Holds only the beginning of the file, which is parsed again
+        # whenever the format is edited.
+        self.preview_processor = DataProcessor()
+
+        # Files are previewed from their first lines. Files larger
+        # than this are streamed when the dialog is finished.
+        self.streaming_size = 64 * 1024 * 1024
+        self.preview_lines = 10000
+        # The tables show only the first rows of the parsed data.
+        self.table_rows = 1000
 
         self.defaultvar = 'none'
         self.radiovar = tk.StringVar(None, self.defaultvar)
 
+        # The files of the deformation modes and their datasets
+        # when all modes of a directory are loaded.
+        self.files = {}
+        self.datasets = {}
+
+        # Long tasks run in a background worker, their progress
+        # is shown in the status bar.
+        self.worker = None
+        self.disabled_buttons = []
+        self.frameStatus = tk.Frame(self)
+        self.labelStatus = tk.Label(self.frameStatus, anchor=tk.W)
+        self.progressbar = ttk.Progressbar(self.frameStatus, maximum=1.0)
+        buttonCancel = tk.Button(self.frameStatus, text='Cancel', command=self.cancel)
+        self.labelStatus.grid(row=0, column=0, sticky=tk.W, padx=5)
+        self.progressbar.grid(row=0, column=1, sticky=tk.W+tk.E, padx=5)
+        buttonCancel.grid(row=0, column=2, sticky=tk.E, padx=5, pady=3)
+        self.frameStatus.grid_columnconfigure(1, weight=1)
+        self.protocol('WM_DELETE_WINDOW', self.cancel_and_destroy)
+
         self.frames = {}
         for F in (PageTwo, PageThree, PageFour, PageFive):
             page_name = F.__name__
@@ -48,11 +83,92 @@ class FileDialog(tk.Toplevel):
         frame = self.frames[page_name]
         frame.tkraise()
 
+    def run(self, task, done):
+        """Runs the task in a background worker and calls done with
+        its result on the Tk thread. The progress of the processor is
+        reported to the status bar. The buttons of the pages are
+        disabled until the task has finished. Does nothing while
+        another task is running."""
+        if self.worker is not None:
+            return
+
+        def work(progress):
+            self.processor.progress = progress
+            try:
+                return task()
+            finally:
+                self.processor.progress = None
+
+        self.worker = Worker(work)
+        self.done = done
+        self.set_buttons_enabled(False)
+        self.labelStatus['text'] = 'Working...'
+        self.progressbar['value'] = 0.0
+        self.frameStatus.pack(side="bottom", fill="x")
+        self.worker.start()
+        self.after(50, self.poll)
+
+    def poll(self):
+        """Shows the progress of the worker and finishes its task."""
+        worker = self.worker
+        if worker is None:
+            return
+        try:
+            while True:
+                kind, value = worker.queue.get_nowait()
+                if kind != 'progress':
+                    break
+                stage, done, total = value
+                self.labelStatus['text'] = stage + '...'
+                self.progressbar['value'] = done / total if total > 0 else 0.0
+        except queue.Empty:
+            self.after(50, self.poll)
+            return
+        self.worker = None
+        self.frameStatus.pack_forget()
+        self.set_buttons_enabled(True)
+        if kind == 'done':
+            self.done(value)
+        elif kind == 'error':
+            if isinstance(value, FileNotFoundError):
+                messagebox.showerror('Error', 'File ' + str(value.filename) + ' was not found.')
+            else:
+                messagebox.showerror('ERROR', str(value))
+
+    def set_buttons_enabled(self, enabled):
+        """Disables the enabled buttons of the pages or enables
+        the buttons disabled here again."""
+        if enabled:
+            for button in self.disabled_buttons:
+                button['state'] = tk.NORMAL
+            self.disabled_buttons = []
+            return
+        self.disabled_buttons = [widget for frame in self.frames.values()
+                                 for widget in frame.winfo_children()
+                                 if isinstance(widget, tk.Button) and
+                                 str(widget['state']) != tk.DISABLED]
+        for button in self.disabled_buttons:
+            button['state'] = tk.DISABLED
+
+    def cancel(self):
+        """Aborts the running task at its next progress report."""
+        if self.worker is not None:
+            self.worker.cancel()
+            self.labelStatus['text'] = 'Cancelling...'
+
+    def cancel_and_destroy(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+        self.destroy()
+
     def close(self):
         defmode = self.radiovar.get()
-        stretch = self.processor.stretch_limited
-        true_stress = self.processor.true_stress_limited
-        self.callback(defmode, stretch, true_stress, self.filename)
+        if defmode == 'ALL':
+            for defmode, dataset in self.datasets.items():
+                self.callback(defmode, dataset)
+        else:
+            self.callback(defmode, self.processor.create_dataset())
         self.destroy()
 
 class PageTwo(tk.Frame):
@@ -68,6 +184,8 @@ class PageTwo(tk.Frame):
         rbUT = tk.Radiobutton(self, text='Uniaxial tension', value='UT', variable=controller.radiovar)
         rbET = tk.Radiobutton(self, text='Equibiaxial tension', value='ET', variable=controller.radiovar)
         rbPS = tk.Radiobutton(self, text='Pure shear', value='PS', variable=controller.radiovar)
+        rbAll = tk.Radiobutton(self, text='All modes (ut.csv, et.csv, ps.csv of a directory)',
+                               value='ALL', variable=controller.radiovar)
         buttonPrev = tk.Button(self, text="<<", state=tk.DISABLED)
         buttonNext = tk.Button(self, text=">>", command=self.next)
         
@@ -79,32 +197,86 @@ class PageTwo(tk.Frame):
         rbUT.grid(row=2, column=0, columnspan=3, sticky=tk.W, padx=5, pady=3)
         rbET.grid(row=3, column=0, columnspan=3, sticky=tk.W, padx=5, pady=3)
         rbPS.grid(row=4, column=0, columnspan=3, sticky=tk.W, padx=5, pady=3)
-        tk.Frame(self).grid(row=5, column=0, columnspan=2)
-        buttonPrev.grid(row=6, column=0, sticky=tk.W, padx=5, pady=5)
-        buttonNext.grid(row=6, column=2, sticky=tk.E, padx=5, pady=5)
+        rbAll.grid(row=5, column=0, columnspan=3, sticky=tk.W, padx=5, pady=3)
+        tk.Frame(self).grid(row=6, column=0, columnspan=2)
+        buttonPrev.grid(row=7, column=0, sticky=tk.W, padx=5, pady=5)
+        buttonNext.grid(row=7, column=2, sticky=tk.E, padx=5, pady=5)
 
-        self.grid_rowconfigure(5, weight=1)
+        self.grid_rowconfigure(6, weight=1)
         self.grid_columnconfigure(1, weight=1)
 
     def browse(self):
-        filename = filedialog.askopenfilename(initialdir=os.getcwd()+'/data',
-                                              title='Open')
+        if self.controller.radiovar.get() == 'ALL':
+            filename = filedialog.askdirectory(initialdir=os.getcwd()+'/data',
+                                               title='Open')
+        else:
+            filename = filedialog.askopenfilename(initialdir=os.getcwd()+'/data',
+                                                  title='Open')
         set_entry(self.entryFilename, filename)
 
     def next(self):
         self.filename = self.entryFilename.get()
+        self.controller.files = {}
+        if self.controller.radiovar.get() == 'ALL':
+            # Preview the first file, the others are processed
+            # with the same options when the dialog is finished.
+            files = find_mode_files(self.filename)
+            if not files:
+                messagebox.showerror('Error', 'Directory ' + self.filename +
+                                     ' contains no ut.csv, et.csv or ps.csv file.')
+                return
+            self.controller.files = files
+            self.filename = next(iter(files.values()))
         self.controller.filename = self.filename
         try:
-            self.controller.processor.load_file(self.filename)
+            # Only the beginning of the file is read until
+            # the format is confirmed.
+            self.controller.preview_processor.load_prefix(self.filename)
         except FileNotFoundError:
             messagebox.showerror('Error', 'File ' + self.filename + ' was not found.')
             return
         if self.controller.radiovar.get() == self.controller.defaultvar:
             messagebox.showerror('Error', 'No deformation mode is selected.')
             return
-        set_text(self.controller.frames['PageThree'].text, '\n'.join(self.controller.processor.lines))
+        page = self.controller.frames['PageThree']
+        sniffed = sniff_format(self.controller.preview_processor.lines)
+        if sniffed is not None:
+            delimiter, decimalsep, header_rows, numeric_columns = sniffed
+            set_entry(page.entryDelimiter, delimiter)
+            set_entry(page.entryDecimalsep, decimalsep)
+            set_entry(page.entryHeaderRows, str(header_rows))
+            if len(numeric_columns) >= 2:
+                pageFour = self.controller.frames['PageFour']
+                set_entry(pageFour.entryDeformation, str(numeric_columns[0]))
+                set_entry(pageFour.entryStress, str(numeric_columns[1]))
+        page.preview()
         self.controller.show_frame("PageThree")
 
+def fill_table(table, processor, max_rows):
+    """Shows the first parsed rows of the processor in a Treeview.
+    Every row is a Tk call on the Tk thread, so a whole file would
+    freeze the dialog.
+    ----------
+    Keyword arguments:
+    table -- The Treeview to fill.
+    processor -- The DataProcessor whose rows are shown.
+    max_rows -- The number of rows shown from the beginning.
+    """
+    columns = processor.max_column_count
+    table['columns'] = [str(c) for c in range(1, columns + 1)]
+    table.heading('#0', text='No.')
+    table.column('#0', anchor='center', width=50, stretch=False)
+    for c in range(1, columns + 1):
+        table.heading(str(c), text='Column ' + str(c))
+        table.column(str(c), anchor='center', stretch=True)
+    table.delete(*table.get_children())
+    i = processor.header_rows
+    for row in processor.rows(max_rows):
+        i += 1
+        table.insert('', 'end', text='#' + str(i), values=row)
+    if processor.values.shape[1] > max_rows:
+        table.insert('', 'end', text='...')
+
 class PageThree(tk.Frame):
     def __init__(self, parent, controller):
         tk.Frame.__init__(self, parent)
@@ -113,26 +285,70 @@ class PageThree(tk.Frame):
         # Initialize widgets.
         label1 = tk.Label(self, text='Delimiter:')
         label2 = tk.Label(self, text='Decimal separator:')
+        label3 = tk.Label(self, text='Header rows:')
         self.entryDelimiter = tk.Entry(self)
         self.entryDecimalsep = tk.Entry(self)
-        self.text = tk.Text(self, state=tk.DISABLED)
+        self.entryHeaderRows = tk.Entry(self)
+        self.table = ttk.Treeview(self)
         buttonPrev = tk.Button(self, text="<<", command=lambda: controller.show_frame("PageTwo"))
         buttonNext = tk.Button(self, text=">>", command=self.next)
         
         # Arrange widgets in a grid.
         label1.grid(row=0, column=0, sticky=tk.W, padx=5)
         label2.grid(row=1, column=0, sticky=tk.W, padx=5)
+        label3.grid(row=2, column=0, sticky=tk.W, padx=5)
         self.entryDelimiter.grid(row=0, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
         self.entryDecimalsep.grid(row=1, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
-        self.text.grid(row=2, column=0, columnspan=2, padx=5, pady=3)
-        buttonPrev.grid(row=3, column=0, sticky=tk.W, padx=5, pady=5)
-        buttonNext.grid(row=3, column=1, sticky=tk.E, padx=5, pady=5)
+        self.entryHeaderRows.grid(row=2, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
+        self.table.grid(row=3, column=0, columnspan=2, sticky=tk.W+tk.E+tk.N+tk.S, padx=5, pady=3)
+        buttonPrev.grid(row=4, column=0, sticky=tk.W, padx=5, pady=5)
+        buttonNext.grid(row=4, column=1, sticky=tk.E, padx=5, pady=5)
 
-        self.grid_rowconfigure(2, weight=1)
+        self.grid_rowconfigure(3, weight=1)
         self.grid_columnconfigure(1, weight=1)
-    
+
+        set_entry(self.entryHeaderRows, '0')
+
+        # Update the preview while typing.
+        for entry in (self.entryDelimiter, self.entryDecimalsep, self.entryHeaderRows):
+            entry.bind('<KeyRelease>', lambda event: self.preview())
+
+    def get_format(self):
+        """Returns the delimiter, the decimal separator and the number
+        of header rows entered, or None if any of them is invalid."""
+        delimiter = self.entryDelimiter.get()
+        if len(delimiter) != 1:
+            # A tab or a space is a valid delimiter.
+            delimiter = delimiter.strip()
+        decimalsep = self.entryDecimalsep.get().strip()
+        try:
+            header_rows = int(self.entryHeaderRows.get())
+        except ValueError:
+            header_rows = -1
+        if len(delimiter) != 1 or len(decimalsep) != 1 or header_rows < 0:
+            return None
+        return delimiter, decimalsep, header_rows
+
+    def preview(self):
+        """Shows the beginning of the file parsed with the entered
+        format. Only the first lines are parsed, never the whole file
+        loaded by next, and nothing is done while a task is running."""
+        if self.controller.worker is not None:
+            return
+        self.table.delete(*self.table.get_children())
+        fmt = self.get_format()
+        if fmt is None:
+            return
+        delimiter, decimalsep, header_rows = fmt
+        processor = self.controller.preview_processor
+        processor.header_rows = header_rows
+        processor.parse_csv(delimiter, decimalsep)
+        fill_table(self.table, processor, self.controller.table_rows)
+
     def next(self):
-        delimiter = self.entryDelimiter.get().strip()
+        delimiter = self.entryDelimiter.get()
+        if len(delimiter) != 1:
+            delimiter = delimiter.strip()
         if len(delimiter) != 1:
             messagebox.showerror('ERROR', 'Delimiter must be a 1-character string.')
             return
@@ -140,21 +356,33 @@ class PageThree(tk.Frame):
         if len(decimalsep) != 1:
             messagebox.showerror('ERROR', 'Decimal separator must be a 1-character string.')
             return
+        try:
+            header_rows = int(self.entryHeaderRows.get())
+        except ValueError:
+            header_rows = -1
+        if header_rows < 0:
+            messagebox.showerror('ERROR', 'Header rows must be a non-negative integer.')
+            return
         processor = self.controller.processor
-        processor.parse_csv(delimiter, decimalsep)
-        columns = processor.max_column_count
-        table = self.controller.frames['PageFour'].table
-        table['columns'] = [str(c) for c in range(1, columns + 1)]
-        table.heading('#0', text='No.')
-        table.column('#0', anchor='center', width=50, stretch=False)
-        for c in range(1, columns + 1):
-            table.heading(str(c), text='Column ' + str(c))
-            table.column(str(c), anchor='center', stretch=True)
-        table.delete(*table.get_children())
-        i = 0
-        for row in processor.raw:
-            i += 1
-            table.insert('', 'end', text='#' + str(i), values=row)
+        filename = self.controller.filename
+        if not os.path.isfile(filename):
+            messagebox.showerror('Error', 'File ' + filename + ' was not found.')
+            return
+        # Only the beginning of the file is previewed. The whole file
+        # is processed when the dialog is finished, unless the cache
+        # holds it already.
+        max_lines = self.controller.preview_lines
+
+        def parse():
+            processor.load_file(filename, max_lines)
+            processor.header_rows = header_rows
+            processor.parse_csv(delimiter, decimalsep)
+
+        self.controller.run(parse, self.parsed)
+
+    def parsed(self, result):
+        fill_table(self.controller.frames['PageFour'].table, self.controller.processor,
+                   self.controller.table_rows)
         self.controller.show_frame("PageFour")
 
 class PageFour(tk.Frame):
@@ -217,20 +445,25 @@ class PageFour(tk.Frame):
         except ValueError:
             messagebox.showerror('ERROR', 'Invalid stress column index.')
             return
-        try:
-            self.controller.processor.define_data(deformation_quantity, deformation_column,
-                                              stress_quantity, stress_column)
-        except ValueError as err:
-            messagebox.showerror('ERROR', str(err))
-            return
-        xdata = self.controller.processor.stretch
-        ydata = self.controller.processor.true_stress
-        plt = self.controller.frames['PageFive'].plt
-        plt.clear()
-        plt.plot(xdata, ydata, 'k.')
-        plt.set_xlabel('stretch')
-        plt.set_ylabel('true stress')
-        self.controller.frames['PageFive'].canvas.draw()
+        processor = self.controller.processor
+        page = self.controller.frames['PageFive']
+        samples = page.get_samples()
+        strategy = page.get_strategy()
+
+        def define():
+            processor.define_data(deformation_quantity, deformation_column,
+                                  stress_quantity, stress_column)
+            if samples is None or strategy is None:
+                return False
+            # Rank the samples for the preview in the background too.
+            processor.strategy = strategy
+            processor.limit_data(samples)
+            return True
+
+        self.controller.run(define, self.defined)
+
+    def defined(self, limited):
+        self.controller.frames['PageFive'].plot(limited)
         self.controller.show_frame("PageFive")
 
 class PageFive(tk.Frame):
@@ -239,22 +472,41 @@ class PageFive(tk.Frame):
         self.controller = controller
         
         # Initialize widgets.
+        labelStrategy = tk.Label(self, text='Downsampling:')
         labelSamples = tk.Label(self, text='Samples:')
+        labelTolerance = tk.Label(self, text='Tolerance:')
+        self.comboboxStrategy = ttk.Combobox(self, state='readonly')
         self.entrySamples = tk.Entry(self)
+        self.entryTolerance = tk.Entry(self)
         self.framePlot = tk.Frame(self)
         buttonPrev = tk.Button(self, text="<<", command=lambda: controller.show_frame("PageFour"))
         buttonNext = tk.Button(self, text="FINISH", command=self.next)
         
         # Arrange widgets in a grid.
-        labelSamples.grid(row=0, column=0, sticky=tk.W, padx=5)
-        self.entrySamples.grid(row=0, column=1, sticky=tk.W+tk.E, padx=5, pady=5)
-        self.framePlot.grid(row=1, column=0, columnspan=2, sticky=tk.N+tk.S+tk.W+tk.E, padx=5)
-        buttonPrev.grid(row=2, column=0, sticky=tk.W, padx=5, pady=5)
-        buttonNext.grid(row=2, column=1, sticky=tk.E, padx=5, pady=5)
+        labelStrategy.grid(row=0, column=0, sticky=tk.W, padx=5)
+        labelSamples.grid(row=1, column=0, sticky=tk.W, padx=5)
+        labelTolerance.grid(row=2, column=0, sticky=tk.W, padx=5)
+        self.comboboxStrategy.grid(row=0, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
+        self.entrySamples.grid(row=1, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
+        self.entryTolerance.grid(row=2, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
+        self.framePlot.grid(row=3, column=0, columnspan=2, sticky=tk.N+tk.S+tk.W+tk.E, padx=5)
+        buttonPrev.grid(row=4, column=0, sticky=tk.W, padx=5, pady=5)
+        buttonNext.grid(row=4, column=1, sticky=tk.E, padx=5, pady=5)
 
-        self.grid_rowconfigure(1, weight=1)
+        self.grid_rowconfigure(3, weight=1)
         self.grid_columnconfigure(1, weight=1)
 
+        # Initialize downsampling strategies.
+        self.strategies = [GreedySpacing(), LargestTriangleThreeBuckets(),
+                           UniformStretch(), StretchBinning(), ErrorBounded()]
+
+        # Initialize list of available downsampling strategies.
+        self.comboboxStrategy['values'] = [s.name for s in self.strategies]
+        self.comboboxStrategy.current(0)
+
+        # Set default tolerance.
+        set_entry(self.entryTolerance, '0.01')
+
         # Initialize a Figure for plotting the model.
         fig = Figure(figsize=(5, 2), dpi=100)
         self.plt = fig.add_subplot(111)
@@ -264,23 +516,114 @@ class PageFive(tk.Frame):
         self.canvas = FigureCanvasTkAgg(fig, self.framePlot)
         self.canvas.get_tk_widget().pack(side=tk.BOTTOM, fill=tk.BOTH, expand=True)
 
-    def next(self):
+        # Re-limit the data while the settings are changed.
+        self.stale = False
+        self.comboboxStrategy.bind('<<ComboboxSelected>>', lambda event: self.preview())
+        self.entrySamples.bind('<KeyRelease>', lambda event: self.preview())
+        self.entryTolerance.bind('<KeyRelease>', lambda event: self.preview())
+
+    def get_samples(self):
+        """Returns the number of samples typed in, -1 if it is empty
+        or None if it is not a valid integer."""
         samples_string = self.entrySamples.get()
         if is_empty_or_whitespace(samples_string):
-            samples = -1
-        else:
+            return -1
+        try:
+            return int(samples_string)
+        except ValueError:
+            return None
+
+    def get_strategy(self):
+        """Returns the selected downsampling strategy or None
+        if its tolerance is not a valid non-negative number."""
+        strategy = self.strategies[self.comboboxStrategy.current()]
+        if isinstance(strategy, ErrorBounded):
             try:
-                samples = int(samples_string)
+                tolerance = float(self.entryTolerance.get())
             except ValueError:
-                messagebox.showerror('ERROR', 'Invalid number of samples.')
-                return
-        self.controller.processor.limit_data(samples)
-        xdatas = self.controller.processor.stretch_limited
-        ydatas = self.controller.processor.true_stress_limited
+                return None
+            if tolerance < 0.0:
+                return None
+            strategy.tolerance = tolerance
+        return strategy
 
-        # Add (1, 0) to datas if it does not exist.
-        if (1.0 not in xdatas):
-            xdatas.append(1.0)
-            ydatas.append(0.0)
+    def preview(self):
+        """Re-limits the data in the background and plots it."""
+        if self.controller.worker is not None:
+            # Preview again when the running task has finished.
+            self.stale = True
+            return
+        samples = self.get_samples()
+        strategy = self.get_strategy()
+        if samples is None or strategy is None:
+            return
+        processor = self.controller.processor
+        processor.strategy = strategy
+        self.controller.run(lambda: processor.limit_data(samples),
+                            lambda result: self.plot())
+
+    def plot(self, limited=True):
+        """Plots the whole data and highlights the samples kept."""
+        processor = self.controller.processor
+        self.plt.clear()
+        self.plt.plot(processor.stretch, processor.true_stress, '.', color='0.75')
+        if limited:
+            self.plt.plot(processor.stretch_limited, processor.true_stress_limited, 'k.')
+        self.plt.set_xlabel('stretch')
+        self.plt.set_ylabel('true stress')
+        self.canvas.draw()
+        if self.stale:
+            self.stale = False
+            self.preview()
 
-        self.controller.close()
\ No newline at end of file
+    def next(self):
+        samples = self.get_samples()
+        if samples is None:
+            messagebox.showerror('ERROR', 'Invalid number of samples.')
+            return
+        strategy = self.get_strategy()
+        if strategy is None:
+            messagebox.showerror('ERROR', 'Tolerance must be a non-negative number.')
+            return
+        processor = self.controller.processor
+        processor.strategy = strategy
+        filename = self.controller.filename
+        files = self.controller.files
+
+        def finish():
+            if files:
+                return self.load_all(files, samples, strategy)
+            # The cache is looked up before the file is read again.
+            processor.process_file(filename, samples,
+                                   processor.delimiter, processor.decimalsep,
+                                   processor.deformation_quantity,
+                                   processor.deformation_column,
+                                   processor.stress_quantity,
+                                   processor.stress_column,
+                                   self.controller.streaming_size)
+            return {}
+
+        self.controller.run(finish, self.finished)
+
+    def finished(self, datasets):
+        self.controller.datasets = datasets
+        self.controller.close()
+
+    def load_all(self, files, samples, strategy):
+        """Processes all files of the directory concurrently with the
+        options of the previewed file. The previewed file is processed
+        in the same batch, so the slowest file bounds the time.
+        ----------
+        Returns:
+        The dictionary of deformation mode to Dataset.
+        """
+        processor = self.controller.processor
+        return load_files(files, samples,
+                          processor.delimiter, processor.decimalsep,
+                          processor.deformation_quantity,
+                          processor.deformation_column,
+                          processor.stress_quantity,
+                          processor.stress_column,
+                          strategy, processor.cache,
+                          processor.header_rows,
+                          progress=processor.progress)
@@ -0,0 +1,64 @@
+from numpy import asarray, float64, absolute, maximum, where, eye, finfo, \
+    vstack, newaxis
+
+def difference_steps(x, relative):
+    """Returns the steps relative * max(1, |x|) with the sign of x.
+    They are rounded to the exactly representable difference of x + h
+    and x, so that the perturbed points differ from x by them."""
+    h = relative * where(x < 0, -1.0, 1.0) * maximum(absolute(x), 1.0)
+    return (x + h) - x
+
+class FiniteDifferences:
+    """Estimates the gradient vector of an objective function from
+    one batched evaluation at all perturbed parameter vectors, instead
+    of one evaluation per parameter. The step of every parameter is
+    scaled to its magnitude with the optimal relative step of the
+    difference scheme."""
+
+    def __init__(self, objfunc_batch, complex_step=False, central=True):
+        """Initializes a FiniteDifferences instance.
+        ----------
+        Keyword arguments:
+        objfunc_batch -- Returns the objective values of size (m,)
+                         at the rows of a parameter matrix of size (m, p).
+        complex_step -- Whether the objective function is analytic and
+                        accepts complex parameters. The complex step
+                        has no cancellation error, so the gradient is
+                        accurate to rounding.
+        central -- Whether central differences with 2 p evaluations
+                   are used instead of forward differences with p + 1
+                   evaluations when the complex step is not used.
+        """
+        self.objfunc_batch = objfunc_batch
+        self.complex_step = complex_step
+        self.central = central
+        self.nfev = 0
+
+    def steps(self, x):
+        """Returns the step of every parameter. The relative step is
+        the square root of the machine epsilon for forward differences
+        and its cube root for central differences, which balances the
+        truncation and the rounding error."""
+        eps = finfo(float64).eps
+        if self.complex_step:
+            # The imaginary step is not added to x, so it is not rounded.
+            return eps * where(x < 0, -1.0, 1.0) * maximum(absolute(x), 1.0)
+        if self.central:
+            return difference_steps(x, eps ** (1 / 3))
+        return difference_steps(x, eps ** 0.5)
+
+    def __call__(self, x):
+        """Returns the gradient vector of size (p,) at x."""
+        x = asarray(x, dtype=float64)
+        h = self.steps(x)
+        p = len(x)
+        self.nfev += 1
+        if self.complex_step:
+            f = self.objfunc_batch(x + 1j * eye(p) * h[newaxis, :])
+            return f.imag / h
+        perturbations = eye(p) * h[newaxis, :]
+        if self.central:
+            f = self.objfunc_batch(vstack([x + perturbations, x - perturbations]))
+            return (f[:p] - f[p:]) / (2 * h)
+        f = self.objfunc_batch(vstack([x, x + perturbations]))
+        return (f[1:] - f[0]) / h
@@ -20,9 +20,16 @@ from weighted_error import WeightedError
 from trust_constr import TrustConstr
 from cobyla import Cobyla
 from slsqp import Slsqp
+from least_squares import LeastSquares, TrustRegionReflective, Dogbox, LevenbergMarquardt, \
+    VariableProjection
+from linear_least_squares import LinearLeastSquares
+from lbfgsb import LBFGSB
+from tnc import TNC
+from bounds import only_bounds
+from finite_differences import FiniteDifferences
 
 class FitDialog(tk.Toplevel):
-    def __init__(self, xdatas, ydatas, callback):
+    def __init__(self, datasets, callback):
         tk.Toplevel.__init__(self)
         self.grab_set()
         self.title('Fit model')
@@ -32,12 +39,12 @@ class FitDialog(tk.Toplevel):
         container.grid_rowconfigure(0, weight=1)
         container.grid_columnconfigure(0, weight=1)
 
-        self.xdatas = xdatas
-        self.ydatas = ydatas
+        self.datasets = datasets
         self.callback = callback
 
         self.frames = {}
-        for F in (PageOne, PageTwo, PageTrustConstr, PageCobyla, PageSlsqp):
+        for F in (PageOne, PageTwo, PageTrustConstr, PageCobyla, PageSlsqp,
+                  PageLeastSquares, PageLBFGSB, PageTNC):
             page_name = F.__name__
             frame = F(parent=container, controller=self)
             self.frames[page_name] = frame
@@ -65,20 +72,20 @@ class PageOne(tk.Frame):
         self.fitUT = tk.BooleanVar()
         self.fitET = tk.BooleanVar()
         self.fitPS = tk.BooleanVar()
-        self.fitUT.set(False if self.controller.xdatas[0] is None else True)
-        self.fitET.set(False if self.controller.xdatas[1] is None else True)
-        self.fitPS.set(False if self.controller.xdatas[2] is None else True)
+        self.fitUT.set(False if self.controller.datasets[0] is None else True)
+        self.fitET.set(False if self.controller.datasets[1] is None else True)
+        self.fitPS.set(False if self.controller.datasets[2] is None else True)
 
         # Initialize widgets.
         labelWeight = tk.Label(self, text='Weights used in optimization:')
         self.checkbuttonUT = tk.Checkbutton(self, variable=self.fitUT,
-            state=tk.DISABLED if self.controller.xdatas[0] is None else tk.NORMAL,
+            state=tk.DISABLED if self.controller.datasets[0] is None else tk.NORMAL,
             text='Uniaxial tension', command=self.update_state)
         self.checkbuttonET = tk.Checkbutton(self, variable=self.fitET,
-            state=tk.DISABLED if self.controller.xdatas[1] is None else tk.NORMAL,
+            state=tk.DISABLED if self.controller.datasets[1] is None else tk.NORMAL,
             text='Equibiaxial tension', command=self.update_state)
         self.checkbuttonPS = tk.Checkbutton(self, variable=self.fitPS,
-            state=tk.DISABLED if self.controller.xdatas[2] is None else tk.NORMAL,
+            state=tk.DISABLED if self.controller.datasets[2] is None else tk.NORMAL,
             text='Pure shear', command=self.update_state)
         self.entryUT = tk.Entry(self)
         self.entryET = tk.Entry(self)
@@ -104,9 +111,9 @@ class PageOne(tk.Frame):
         self.grid_columnconfigure(1, weight=1)
 
         # Initialize default entry values.
-        set_entry(self.entryUT, '' if self.controller.xdatas[0] is None else '1')
-        set_entry(self.entryET, '1' if self.controller.xdatas[1] is None else '1')
-        set_entry(self.entryPS, '1' if self.controller.xdatas[2] is None else '1')
+        set_entry(self.entryUT, '' if self.controller.datasets[0] is None else '1')
+        set_entry(self.entryET, '1' if self.controller.datasets[1] is None else '1')
+        set_entry(self.entryPS, '1' if self.controller.datasets[2] is None else '1')
 
     def update_state(self):
         self.entryUT['state'] = tk.NORMAL if self.fitUT.get() else tk.DISABLED
@@ -197,7 +204,9 @@ class PageTwo(tk.Frame):
         self.models = [Ogden(1), Ogden(2), Ogden(3), NeoHooke(), MooneyRivlin(), 
                        Yeoh(), ArrudaBoyce()]
         self.error_functions = [RMSAE, RMSRE]
-        self.methods = [TrustConstr(), Cobyla(), Slsqp()]
+        self.methods = [TrustConstr(), Cobyla(), Slsqp(), LBFGSB(), TNC(),
+                        TrustRegionReflective(), Dogbox(), LevenbergMarquardt(),
+                        LinearLeastSquares(), VariableProjection()]
 
         # Initialize list of available models.
         self.comboboxModel['values'] = [m.name for m in self.models]
@@ -215,37 +224,47 @@ class PageTwo(tk.Frame):
         model = self.models[self.comboboxModel.current()]
         error_function = self.error_functions[self.comboboxError.current()]
         method = self.methods[self.comboboxMethod.current()]
+        if isinstance(method, LinearLeastSquares) and not model.linear:
+            messagebox.showerror('ERROR', 'The ' + model.name + ' model is not linear ' + \
+                'in its parameters. Choose another optimization method.')
+            return
+        if isinstance(method, VariableProjection) and getattr(model, 'linear_params', None) is None:
+            messagebox.showerror('ERROR', 'Variable projection is not available ' + \
+                'for the ' + model.name + ' model.')
+            return
+        if isinstance(method, (LBFGSB, TNC)) and \
+                not only_bounds(model.constraint_matrix, model.paramcount):
+            messagebox.showerror('ERROR', 'The constraint of the ' + model.name + \
+                ' model cannot be expressed as bounds. Choose another optimization method.')
+            return
         self.controller.model = model
         self.controller.error_function = error_function
         self.controller.method = method
         
         # Define errors.
-        if self.controller.xdatas[0] is None:
+        dataset = self.controller.datasets[0]
+        if dataset is None:
             errorUT = None
         else:
-            points = zip(self.controller.xdatas[0], self.controller.ydatas[0])
-            points_without_origin = [point for point in points if point[0] != 1.0]
-            xdata = [point[0] for point in points_without_origin]
-            ydata = [point[1] for point in points_without_origin]
-            errorUT = error_function(model.ut, model.ut_jac, model.ut_hess, xdata, ydata)
+            errorUT = error_function(model, 0,
+                                      dataset.fit_stretch, dataset.fit_stress,
+                                      dataset.kinematics(0))
 
-        if self.controller.xdatas[1] is None:
+        dataset = self.controller.datasets[1]
+        if dataset is None:
             errorET = None
         else:
-            points = zip(self.controller.xdatas[1], self.controller.ydatas[1])
-            points_without_origin = [point for point in points if point[0] != 1.0]
-            xdata = [point[0] for point in points_without_origin]
-            ydata = [point[1] for point in points_without_origin]
-            errorET = error_function(model.et, model.et_jac, model.et_hess, xdata, ydata)
+            errorET = error_function(model, 1,
+                                      dataset.fit_stretch, dataset.fit_stress,
+                                      dataset.kinematics(1))
 
-        if self.controller.xdatas[2] is None:
+        dataset = self.controller.datasets[2]
+        if dataset is None:
             errorPS = None
         else:
-            points = zip(self.controller.xdatas[2], self.controller.ydatas[2])
-            points_without_origin = [point for point in points if point[0] != 1.0]
-            xdata = [point[0] for point in points_without_origin]
-            ydata = [point[1] for point in points_without_origin]
-            errorPS = error_function(model.ps, model.ps_jac, model.ps_hess, xdata, ydata)
+            errorPS = error_function(model, 2,
+                                      dataset.fit_stretch, dataset.fit_stress,
+                                      dataset.kinematics(2))
 
         errors = [errorUT, errorET, errorPS]
         weights = [self.controller.weightUT,
@@ -260,8 +279,20 @@ class PageTwo(tk.Frame):
 
         # Set method parameters.
         method.objfunc = weighted_error.objfunc
+        method.objfunc_and_jac = weighted_error.objfunc_and_jac
+        method.residuals = weighted_error.residuals
+        method.residuals_jac = weighted_error.residuals_jac
+        method.reweight = weighted_error.reweight
         method.constraint = model.constraint
+        method.constraint_jac = model.constraint_jac
+        method.constraint_matrix = model.constraint_matrix
         method.x0 = model.guess()
+        if isinstance(method, VariableProjection):
+            # Only the nonlinear parameters need an initial guess.
+            method.linear_params = model.linear_params
+            nonlinear = [i for i in range(model.paramcount) if i not in model.linear_params]
+            for i, value in zip(nonlinear, model.guess_nonlinear()):
+                method.x0[i] = value
 
         # Navigate to page appropriate to optimization method.
         if isinstance(method, TrustConstr):
@@ -270,6 +301,16 @@ class PageTwo(tk.Frame):
             page_name = "PageCobyla"
         if isinstance(method, Slsqp):
             page_name = "PageSlsqp"
+        if isinstance(method, LBFGSB):
+            page_name = "PageLBFGSB"
+        if isinstance(method, TNC):
+            page_name = "PageTNC"
+        if isinstance(method, LeastSquares):
+            page_name = "PageLeastSquares"
+        if isinstance(method, LinearLeastSquares):
+            # The solution is direct, there is nothing to set.
+            self.controller.close()
+            return
         self.controller.frames[page_name].update()
         self.controller.show_frame(page_name)
 
@@ -280,13 +321,22 @@ class PageTrustConstr(tk.Frame):
 
         # Initialize tk bound variables.
         self.calcJac = tk.BooleanVar()
+        self.batchedJac = tk.BooleanVar()
         self.calcHess = tk.BooleanVar()
+        self.gaussNewton = tk.BooleanVar()
+        self.useHessp = tk.BooleanVar()
         self.calcJac.set(True)
+        self.batchedJac.set(False)
         self.calcHess.set(False)
+        self.gaussNewton.set(False)
+        self.useHessp.set(False)
 
         # Initialize widgets.
         labelJac = tk.Label(self, text='Calculate Jacobian:')
+        labelBatchedJac = tk.Label(self, text='Batched Jacobian estimate:')
         labelHess = tk.Label(self, text='Calculate Hessian:')
+        labelGaussNewton = tk.Label(self, text='Gauss-Newton Hessian:')
+        labelHessp = tk.Label(self, text='Hessian-vector products:')
         labelXtol = tk.Label(self, text='Xtol:')
         labelGtol = tk.Label(self, text='Gtol:')
         labelBtol = tk.Label(self, text='Barrier tolerance:')
@@ -296,7 +346,10 @@ class PageTrustConstr(tk.Frame):
         labelInitBarrPar = tk.Label(self, text='Initial barrier parameter:')
         labelInitBarrTol = tk.Label(self, text='Initial barrier tolerance:')
         self.checkbuttonJac = tk.Checkbutton(self, variable=self.calcJac)
+        self.checkbuttonBatchedJac = tk.Checkbutton(self, variable=self.batchedJac)
         self.checkbuttonHess = tk.Checkbutton(self, variable=self.calcHess)
+        self.checkbuttonGaussNewton = tk.Checkbutton(self, variable=self.gaussNewton)
+        self.checkbuttonHessp = tk.Checkbutton(self, variable=self.useHessp)
         self.entryXtol = tk.Entry(self)
         self.entryGtol = tk.Entry(self)
         self.entryBtol = tk.Entry(self)
@@ -311,30 +364,36 @@ class PageTrustConstr(tk.Frame):
         
         # Arrange widgets in grid.
         labelJac.grid(row=0, column=0, sticky=tk.W, padx=5)
-        labelHess.grid(row=1, column=0, sticky=tk.W, padx=5)
-        labelXtol.grid(row=2, column=0, sticky=tk.W, padx=5)
-        labelGtol.grid(row=3, column=0, sticky=tk.W, padx=5)
-        labelBtol.grid(row=4, column=0, sticky=tk.W, padx=5)
-        labelMaxiter.grid(row=5, column=0, sticky=tk.W, padx=5)
-        labelInitConstrPen.grid(row=6, column=0, sticky=tk.W, padx=5)
-        labelInitTrustRad.grid(row=7, column=0, sticky=tk.W, padx=5)
-        labelInitBarrPar.grid(row=8, column=0, sticky=tk.W, padx=5)
-        labelInitBarrTol.grid(row=9, column=0, sticky=tk.W, padx=5)
+        labelBatchedJac.grid(row=1, column=0, sticky=tk.W, padx=5)
+        labelHess.grid(row=2, column=0, sticky=tk.W, padx=5)
+        labelGaussNewton.grid(row=3, column=0, sticky=tk.W, padx=5)
+        labelHessp.grid(row=4, column=0, sticky=tk.W, padx=5)
+        labelXtol.grid(row=5, column=0, sticky=tk.W, padx=5)
+        labelGtol.grid(row=6, column=0, sticky=tk.W, padx=5)
+        labelBtol.grid(row=7, column=0, sticky=tk.W, padx=5)
+        labelMaxiter.grid(row=8, column=0, sticky=tk.W, padx=5)
+        labelInitConstrPen.grid(row=9, column=0, sticky=tk.W, padx=5)
+        labelInitTrustRad.grid(row=10, column=0, sticky=tk.W, padx=5)
+        labelInitBarrPar.grid(row=11, column=0, sticky=tk.W, padx=5)
+        labelInitBarrTol.grid(row=12, column=0, sticky=tk.W, padx=5)
         self.checkbuttonJac.grid(row=0, column=1, sticky=tk.W)
-        self.checkbuttonHess.grid(row=1, column=1, sticky=tk.W)
-        self.entryXtol.grid(row=2, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
-        self.entryGtol.grid(row=3, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
-        self.entryBtol.grid(row=4, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
-        self.entryMaxiter.grid(row=5, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
-        self.entryInitConstrPen.grid(row=6, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
-        self.entryInitTrustRad.grid(row=7, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
-        self.entryInitBarrPar.grid(row=8, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
-        self.entryInitBarrTol.grid(row=9, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
-        tk.Frame().grid(row=10, column=0, columnspan=2)
-        buttonPrev.grid(row=11, column=0, sticky=tk.W, padx=5, pady=5)
-        buttonNext.grid(row=11, column=1, sticky=tk.E, padx=5, pady=5)
-
-        self.grid_rowconfigure(10, weight=1)
+        self.checkbuttonBatchedJac.grid(row=1, column=1, sticky=tk.W)
+        self.checkbuttonHess.grid(row=2, column=1, sticky=tk.W)
+        self.checkbuttonGaussNewton.grid(row=3, column=1, sticky=tk.W)
+        self.checkbuttonHessp.grid(row=4, column=1, sticky=tk.W)
+        self.entryXtol.grid(row=5, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
+        self.entryGtol.grid(row=6, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
+        self.entryBtol.grid(row=7, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
+        self.entryMaxiter.grid(row=8, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
+        self.entryInitConstrPen.grid(row=9, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
+        self.entryInitTrustRad.grid(row=10, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
+        self.entryInitBarrPar.grid(row=11, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
+        self.entryInitBarrTol.grid(row=12, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
+        tk.Frame().grid(row=13, column=0, columnspan=2)
+        buttonPrev.grid(row=14, column=0, sticky=tk.W, padx=5, pady=5)
+        buttonNext.grid(row=14, column=1, sticky=tk.E, padx=5, pady=5)
+
+        self.grid_rowconfigure(13, weight=1)
         self.grid_columnconfigure(1, weight=1)
 
     def update(self):
@@ -409,12 +468,25 @@ class PageTrustConstr(tk.Frame):
         if self.calcJac.get():
             method.calcJac = True
             method.jac = weighted_error.jac
+        elif self.batchedJac.get():
+            # Estimate the gradient from one batched evaluation
+            # of the model at all perturbed parameter vectors.
+            method.calcJac = False
+            method.jac = FiniteDifferences(weighted_error.objfunc_batch,
+                                           self.controller.model.complex_step)
         else:
             method.calcJac = False
             method.jac = '2-point'
+        method.gaussNewton = self.gaussNewton.get()
+        method.useHessp = self.useHessp.get()
         if self.calcHess.get():
             method.calcHess = True
-            method.hess = weighted_error.hess
+            if method.gaussNewton:
+                method.hess = weighted_error.gauss_newton_hess
+                method.hessp = weighted_error.gauss_newton_hessp
+            else:
+                method.hess = weighted_error.hess
+                method.hessp = weighted_error.hessp
         else:
             method.calcHess = False
             method.hess = BFGS()
@@ -517,11 +589,17 @@ class PageSlsqp(tk.Frame):
         tk.Frame.__init__(self, parent)
         self.controller = controller
 
+        # Initialize tk bound variables.
+        self.calcJac = tk.BooleanVar()
+        self.calcJac.set(True)
+
         # Initialize widgets.
+        labelJac = tk.Label(self, text='Calculate Jacobian:')
         labelTol = tk.Label(self, text='Tol:')
         labelMaxiter = tk.Label(self, text='Maxiter:')
         labelFtol = tk.Label(self, text='Ftol:')
         labelEps = tk.Label(self, text='Eps:')
+        self.checkbuttonJac = tk.Checkbutton(self, variable=self.calcJac)
         self.entryTol = tk.Entry(self)
         self.entryMaxiter = tk.Entry(self)
         self.entryFtol = tk.Entry(self)
@@ -531,19 +609,21 @@ class PageSlsqp(tk.Frame):
         buttonNext = tk.Button(self, text="FIT", command=self.next)
         
         # Arrange widgets in grid.
-        labelTol.grid(row=0, column=0, sticky=tk.W, padx=5)
-        labelMaxiter.grid(row=1, column=0, sticky=tk.W, padx=5)
-        labelFtol.grid(row=2, column=0, sticky=tk.W, padx=5)
-        labelEps.grid(row=3, column=0, sticky=tk.W, padx=5)
-        self.entryTol.grid(row=0, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
-        self.entryMaxiter.grid(row=1, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
-        self.entryFtol.grid(row=2, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
-        self.entryEps.grid(row=3, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
-        tk.Frame().grid(row=4, column=0, columnspan=2)
-        buttonPrev.grid(row=5, column=0, sticky=tk.W, padx=5, pady=5)
-        buttonNext.grid(row=5, column=1, sticky=tk.E, padx=5, pady=5)
+        labelJac.grid(row=0, column=0, sticky=tk.W, padx=5)
+        labelTol.grid(row=1, column=0, sticky=tk.W, padx=5)
+        labelMaxiter.grid(row=2, column=0, sticky=tk.W, padx=5)
+        labelFtol.grid(row=3, column=0, sticky=tk.W, padx=5)
+        labelEps.grid(row=4, column=0, sticky=tk.W, padx=5)
+        self.checkbuttonJac.grid(row=0, column=1, sticky=tk.W)
+        self.entryTol.grid(row=1, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
+        self.entryMaxiter.grid(row=2, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
+        self.entryFtol.grid(row=3, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
+        self.entryEps.grid(row=4, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
+        tk.Frame().grid(row=5, column=0, columnspan=2)
+        buttonPrev.grid(row=6, column=0, sticky=tk.W, padx=5, pady=5)
+        buttonNext.grid(row=6, column=1, sticky=tk.E, padx=5, pady=5)
 
-        self.grid_rowconfigure(4, weight=1)
+        self.grid_rowconfigure(5, weight=1)
         self.grid_columnconfigure(1, weight=1)
 
     def update(self):
@@ -585,12 +665,290 @@ class PageSlsqp(tk.Frame):
             eps = float(s)
         except ValueError:
             messagebox.showerror('ERROR', 'Invalid eps value "' + s + '".')
+            return
 
-        # Set COBYLA specific parameters.
+        # Set SLSQP specific parameters.
         method = self.controller.method
+        method.calcJac = self.calcJac.get()
         method.tol = tol
         method.maxiter = maxiter
         method.ftol = ftol
         method.eps = eps
 
-        self.controller.close()
\ No newline at end of file
+        self.controller.close()
+
+class PageLeastSquares(tk.Frame):
+    def __init__(self, parent, controller):
+        tk.Frame.__init__(self, parent)
+        self.controller = controller
+
+        # Initialize tk bound variables.
+        self.calcJac = tk.BooleanVar()
+        self.calcJac.set(True)
+
+        # Initialize widgets.
+        labelJac = tk.Label(self, text='Calculate Jacobian:')
+        labelFtol = tk.Label(self, text='Ftol:')
+        labelXtol = tk.Label(self, text='Xtol:')
+        labelGtol = tk.Label(self, text='Gtol:')
+        labelMaxNfev = tk.Label(self, text='Maximum function evaluations:')
+        self.checkbuttonJac = tk.Checkbutton(self, variable=self.calcJac)
+        self.entryFtol = tk.Entry(self)
+        self.entryXtol = tk.Entry(self)
+        self.entryGtol = tk.Entry(self)
+        self.entryMaxNfev = tk.Entry(self)
+        buttonPrev = tk.Button(self, text="<<",
+                               command=lambda: controller.show_frame("PageTwo"))
+        buttonNext = tk.Button(self, text="FIT", command=self.next)
+        
+        # Arrange widgets in grid.
+        labelJac.grid(row=0, column=0, sticky=tk.W, padx=5)
+        labelFtol.grid(row=1, column=0, sticky=tk.W, padx=5)
+        labelXtol.grid(row=2, column=0, sticky=tk.W, padx=5)
+        labelGtol.grid(row=3, column=0, sticky=tk.W, padx=5)
+        labelMaxNfev.grid(row=4, column=0, sticky=tk.W, padx=5)
+        self.checkbuttonJac.grid(row=0, column=1, sticky=tk.W)
+        self.entryFtol.grid(row=1, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
+        self.entryXtol.grid(row=2, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
+        self.entryGtol.grid(row=3, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
+        self.entryMaxNfev.grid(row=4, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
+        tk.Frame().grid(row=5, column=0, columnspan=2)
+        buttonPrev.grid(row=6, column=0, sticky=tk.W, padx=5, pady=5)
+        buttonNext.grid(row=6, column=1, sticky=tk.E, padx=5, pady=5)
+
+        self.grid_rowconfigure(5, weight=1)
+        self.grid_columnconfigure(1, weight=1)
+
+    def update(self):
+        # Initialize default entry values.
+        method = self.controller.method
+        set_entry(self.entryFtol, str(method.ftol))
+        set_entry(self.entryXtol, str(method.xtol))
+        set_entry(self.entryGtol, str(method.gtol))
+        set_entry(self.entryMaxNfev, '' if method.max_nfev is None else str(method.max_nfev))
+
+    def next(self):
+        # Parse parameters from GUI.
+        try:
+            s = self.entryFtol.get().strip()
+            ftol = float(s)
+        except ValueError:
+            messagebox.showerror('ERROR', 'Invalid ftol value "' + s + '".')
+            return
+        try:
+            s = self.entryXtol.get().strip()
+            xtol = float(s)
+        except ValueError:
+            messagebox.showerror('ERROR', 'Invalid xtol value "' + s + '".')
+            return
+        try:
+            s = self.entryGtol.get().strip()
+            gtol = float(s)
+        except ValueError:
+            messagebox.showerror('ERROR', 'Invalid gtol value "' + s + '".')
+            return
+        try:
+            s = self.entryMaxNfev.get().strip()
+            if s == '':
+                max_nfev = None
+            else:
+                max_nfev = int(s)
+        except ValueError:
+            messagebox.showerror('ERROR', 'Invalid maximum function evaluations value "' + s + '".')
+            return
+        if max_nfev is not None and max_nfev < 1:
+            messagebox.showerror('ERROR', 'Maximum function evaluations must be positive.')
+            return
+
+        # Set least squares specific parameters.
+        method = self.controller.method
+        method.calcJac = self.calcJac.get()
+        method.ftol = ftol
+        method.xtol = xtol
+        method.gtol = gtol
+        method.max_nfev = max_nfev
+
+        self.controller.close()
+
+class PageLBFGSB(tk.Frame):
+    def __init__(self, parent, controller):
+        tk.Frame.__init__(self, parent)
+        self.controller = controller
+
+        # Initialize tk bound variables.
+        self.calcJac = tk.BooleanVar()
+        self.calcJac.set(True)
+
+        # Initialize widgets.
+        labelJac = tk.Label(self, text='Calculate Jacobian:')
+        labelMaxcor = tk.Label(self, text='Maximum corrections:')
+        labelFtol = tk.Label(self, text='Ftol:')
+        labelGtol = tk.Label(self, text='Gtol:')
+        labelMaxiter = tk.Label(self, text='Maximum iterations:')
+        self.checkbuttonJac = tk.Checkbutton(self, variable=self.calcJac)
+        self.entryMaxcor = tk.Entry(self)
+        self.entryFtol = tk.Entry(self)
+        self.entryGtol = tk.Entry(self)
+        self.entryMaxiter = tk.Entry(self)
+        buttonPrev = tk.Button(self, text="<<",
+                               command=lambda: controller.show_frame("PageTwo"))
+        buttonNext = tk.Button(self, text="FIT", command=self.next)
+
+        # Arrange widgets in grid.
+        labelJac.grid(row=0, column=0, sticky=tk.W, padx=5)
+        labelMaxcor.grid(row=1, column=0, sticky=tk.W, padx=5)
+        labelFtol.grid(row=2, column=0, sticky=tk.W, padx=5)
+        labelGtol.grid(row=3, column=0, sticky=tk.W, padx=5)
+        labelMaxiter.grid(row=4, column=0, sticky=tk.W, padx=5)
+        self.checkbuttonJac.grid(row=0, column=1, sticky=tk.W)
+        self.entryMaxcor.grid(row=1, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
+        self.entryFtol.grid(row=2, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
+        self.entryGtol.grid(row=3, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
+        self.entryMaxiter.grid(row=4, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
+        tk.Frame().grid(row=5, column=0, columnspan=2)
+        buttonPrev.grid(row=6, column=0, sticky=tk.W, padx=5, pady=5)
+        buttonNext.grid(row=6, column=1, sticky=tk.E, padx=5, pady=5)
+
+        self.grid_rowconfigure(5, weight=1)
+        self.grid_columnconfigure(1, weight=1)
+
+    def update(self):
+        # Initialize default entry values.
+        method = self.controller.method
+        set_entry(self.entryMaxcor, str(method.maxcor))
+        set_entry(self.entryFtol, str(method.ftol))
+        set_entry(self.entryGtol, str(method.gtol))
+        set_entry(self.entryMaxiter, str(method.maxiter))
+
+    def next(self):
+        # Parse parameters from GUI.
+        try:
+            s = self.entryMaxcor.get().strip()
+            maxcor = int(s)
+        except ValueError:
+            messagebox.showerror('ERROR', 'Invalid maximum corrections value "' + s + '".')
+            return
+        if maxcor < 1:
+            messagebox.showerror('ERROR', 'Maximum corrections must be positive.')
+            return
+        try:
+            s = self.entryFtol.get().strip()
+            ftol = float(s)
+        except ValueError:
+            messagebox.showerror('ERROR', 'Invalid ftol value "' + s + '".')
+            return
+        try:
+            s = self.entryGtol.get().strip()
+            gtol = float(s)
+        except ValueError:
+            messagebox.showerror('ERROR', 'Invalid gtol value "' + s + '".')
+            return
+        try:
+            s = self.entryMaxiter.get().strip()
+            maxiter = int(s)
+        except ValueError:
+            messagebox.showerror('ERROR', 'Invalid maximum iterations value "' + s + '".')
+            return
+        if maxiter < 1:
+            messagebox.showerror('ERROR', 'Maximum iterations must be positive.')
+            return
+
+        # Set L-BFGS-B specific parameters.
+        method = self.controller.method
+        method.calcJac = self.calcJac.get()
+        method.maxcor = maxcor
+        method.ftol = ftol
+        method.gtol = gtol
+        method.maxiter = maxiter
+
+        self.controller.close()
+
+class PageTNC(tk.Frame):
+    def __init__(self, parent, controller):
+        tk.Frame.__init__(self, parent)
+        self.controller = controller
+
+        # Initialize tk bound variables.
+        self.calcJac = tk.BooleanVar()
+        self.calcJac.set(True)
+
+        # Initialize widgets.
+        labelJac = tk.Label(self, text='Calculate Jacobian:')
+        labelFtol = tk.Label(self, text='Ftol:')
+        labelXtol = tk.Label(self, text='Xtol:')
+        labelGtol = tk.Label(self, text='Gtol:')
+        labelMaxfun = tk.Label(self, text='Maximum function evaluations:')
+        self.checkbuttonJac = tk.Checkbutton(self, variable=self.calcJac)
+        self.entryFtol = tk.Entry(self)
+        self.entryXtol = tk.Entry(self)
+        self.entryGtol = tk.Entry(self)
+        self.entryMaxfun = tk.Entry(self)
+        buttonPrev = tk.Button(self, text="<<",
+                               command=lambda: controller.show_frame("PageTwo"))
+        buttonNext = tk.Button(self, text="FIT", command=self.next)
+
+        # Arrange widgets in grid.
+        labelJac.grid(row=0, column=0, sticky=tk.W, padx=5)
+        labelFtol.grid(row=1, column=0, sticky=tk.W, padx=5)
+        labelXtol.grid(row=2, column=0, sticky=tk.W, padx=5)
+        labelGtol.grid(row=3, column=0, sticky=tk.W, padx=5)
+        labelMaxfun.grid(row=4, column=0, sticky=tk.W, padx=5)
+        self.checkbuttonJac.grid(row=0, column=1, sticky=tk.W)
+        self.entryFtol.grid(row=1, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
+        self.entryXtol.grid(row=2, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
+        self.entryGtol.grid(row=3, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
+        self.entryMaxfun.grid(row=4, column=1, sticky=tk.W+tk.E, padx=5, pady=3)
+        tk.Frame().grid(row=5, column=0, columnspan=2)
+        buttonPrev.grid(row=6, column=0, sticky=tk.W, padx=5, pady=5)
+        buttonNext.grid(row=6, column=1, sticky=tk.E, padx=5, pady=5)
+
+        self.grid_rowconfigure(5, weight=1)
+        self.grid_columnconfigure(1, weight=1)
+
+    def update(self):
+        # Initialize default entry values.
+        method = self.controller.method
+        set_entry(self.entryFtol, str(method.ftol))
+        set_entry(self.entryXtol, str(method.xtol))
+        set_entry(self.entryGtol, str(method.gtol))
+        set_entry(self.entryMaxfun, str(method.maxfun))
+
+    def next(self):
+        # Parse parameters from GUI.
+        try:
+            s = self.entryFtol.get().strip()
+            ftol = float(s)
+        except ValueError:
+            messagebox.showerror('ERROR', 'Invalid ftol value "' + s + '".')
+            return
+        try:
+            s = self.entryXtol.get().strip()
+            xtol = float(s)
+        except ValueError:
+            messagebox.showerror('ERROR', 'Invalid xtol value "' + s + '".')
+            return
+        try:
+            s = self.entryGtol.get().strip()
+            gtol = float(s)
+        except ValueError:
+            messagebox.showerror('ERROR', 'Invalid gtol value "' + s + '".')
+            return
+        try:
+            s = self.entryMaxfun.get().strip()
+            maxfun = int(s)
+        except ValueError:
+            messagebox.showerror('ERROR', 'Invalid maximum function evaluations value "' + s + '".')
+            return
+        if maxfun < 1:
+            messagebox.showerror('ERROR', 'Maximum function evaluations must be positive.')
+            return
+
+        # Set TNC specific parameters.
+        method = self.controller.method
+        method.calcJac = self.calcJac.get()
+        method.ftol = ftol
+        method.xtol = xtol
+        method.gtol = gtol
+        method.maxfun = maxfun
+
+        self.controller.close()
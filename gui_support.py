@@ -50,14 +50,10 @@ class GuiSupport:
         self.root.iconbitmap('hypercalib.ico')
 
         # Initialize data variables.
-        self.xdatas = [None] * 3
-        self.ydatas = [None] * 3
+        self.datasets = [None] * 3
         self.plot_xdatas = [None] * 3
         self.plot_ydatas = [None] * 3
 
-        # Initialize filename variables.
-        self.filenames = [None] * 3
-
         # Initialize model and function variables.
         self.model = None
 
@@ -115,7 +111,7 @@ class GuiSupport:
     def ButtonProcess_Click(self):
         FileDialog(self.file_loaded)
 
-    def file_loaded(self, defmode, stretch, true_stress, filename):
+    def file_loaded(self, defmode, dataset):
         # Load read data into actual data variables.
         if defmode == 'UT':
             defmode_index = 0
@@ -123,8 +119,7 @@ class GuiSupport:
             defmode_index = 1
         if defmode == 'PS':
             defmode_index = 2
-        self.xdatas[defmode_index] = stretch
-        self.ydatas[defmode_index] = true_stress
+        self.datasets[defmode_index] = dataset
 
         # Enable this deformation mode in GUI.
         self.plot_defmode[defmode_index] = True
@@ -133,11 +128,8 @@ class GuiSupport:
         # Enable model fitting.
         self.w.ButtonFitModel['state'] = tk.NORMAL
 
-        # Save filename.
-        self.filenames[defmode_index] = filename
-
     def ButtonFitModel_Click(self):
-        FitDialog(self.xdatas, self.ydatas, self.start_fit)
+        FitDialog(self.datasets, self.start_fit)
 
     def name(self, i):
         if i == 0:
@@ -183,22 +175,29 @@ Optimization method: {3}
         thread.start()
 
     def ButtonPlotSettings_Click(self):
-        loaded_defmode = [self.xdatas[i] is not None for i in range(3)]
+        loaded_defmode = [self.datasets[i] is not None for i in range(3)]
         PlotSettingsDialog(self.update_plot_settings, loaded_defmode, self.plot_defmode,
                            self.plot_error, self.plot_deformation, self.plot_stress)
 
     def ButtonCreateReport_Click(self):
-        CreateReportDialog(self.xdatas, self.ydatas, self.model, 
+        CreateReportDialog(self.datasets, self.model,
                            self.params, self.plot_defmode, self.plot_error,
                            self.plot_deformation, self.plot_stress,
-                           self.filenames, self.weights, self.method,
-                           self.fit_error)
+                           self.weights, self.method, self.fit_error)
 
     def fit_model(self):
         start_time = process_time()
 
         self.error_values = []
-        result = self.method.minimize(self.update_model)
+        try:
+            result = self.method.minimize(self.update_model)
+        except ValueError as err:
+            # The optimizer stops when the stress of the model
+            # overflows, e.g. at large Ogden exponents.
+            self.print('Fitting has failed: ' + str(err))
+            self.w.ButtonProcess['state'] = tk.NORMAL
+            self.w.ButtonFitModel['state'] = tk.NORMAL
+            return
 
         self.update_model(result.x, result)
         self.update_plot_settings()
@@ -231,23 +230,17 @@ Elapsed time: {1:.4f} s
         
         # Update datas, errors.
         for defmode in range(3):
-            if self.xdatas[defmode] is None:
+            dataset = self.datasets[defmode]
+            if dataset is None:
                 continue
-            self.plot_xdatas[defmode] = np.zeros(len(self.xdatas[defmode]))
-            self.plot_ydatas[defmode] = np.zeros(len(self.ydatas[defmode]))
-            for i in range(len(self.xdatas[defmode])):
-                stretch = self.xdatas[defmode][i]
-                true_stress = self.ydatas[defmode][i]
-                self.plot_xdatas[defmode][i] = deformation_quantity.from_stretch(stretch)
-                self.plot_ydatas[defmode][i] = stress_quantity.from_true_stress(true_stress, stretch)
+            self.plot_xdatas[defmode] = deformation_quantity.from_stretch(dataset.stretch)
+            self.plot_ydatas[defmode] = stress_quantity.from_true_stress(dataset.stress, dataset.stretch)
             if self.model is None:
                 self.errors[defmode] = None
             else:
-                self.errors[defmode] = error(self.model.getfunc(defmode),
-                                                self.model.getjac(defmode),
-                                                self.model.gethess(defmode),
-                                                self.xdatas[defmode],
-                                                self.ydatas[defmode])
+                self.errors[defmode] = error(self.model, defmode,
+                                                dataset.stretch,
+                                                dataset.stress)
 
         # Update self variables.
         self.plot_defmode = plot_defmode
@@ -264,7 +257,7 @@ Elapsed time: {1:.4f} s
 
         for defmode in range(3):
             # Plot read data as points.
-            if self.xdatas[defmode] is None or not self.plot_defmode[defmode]:
+            if self.datasets[defmode] is None or not self.plot_defmode[defmode]:
                 continue
             
             xdata = self.plot_xdatas[defmode]
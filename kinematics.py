@@ -0,0 +1,90 @@
+from numpy import power, log, sqrt, asarray, float64, newaxis
+
+class Kinematics:
+    """Holds the functions of the stretch of one deformation mode
+    which do not depend on the model parameters: the stretch powers,
+    the log stretch, the invariants and the chain stretch. Every
+    quantity is calculated on first use and kept, so the evaluations
+    of an optimizer only do the parameter-dependent arithmetic.
+    The deformation is incompressible, the principal stretches are
+    (l, l^-1/2, l^-1/2) in uniaxial tension, (l, l, l^-2) in
+    equibiaxial tension and (l, 1, l^-1) in pure shear."""
+
+    def __init__(self, defmode, stretch):
+        """Initializes a Kinematics instance.
+        ----------
+        Keyword arguments:
+        defmode -- The deformation mode (0: UT, 1: ET, 2: PS).
+        stretch -- The stretch value or array of size (n,).
+        """
+        if defmode not in (0, 1, 2):
+            raise NotImplementedError
+        self.defmode = defmode
+        self.stretch = asarray(stretch, dtype=float64)
+        self.values = {}
+
+    def __len__(self):
+        return len(self.stretch)
+
+    def get(self, key, compute):
+        """Returns the quantity of the given key, which is calculated
+        by the callable compute if it is not kept yet. The returned
+        arrays are read-only."""
+        value = self.values.get(key)
+        if value is None:
+            value = asarray(compute())
+            value.setflags(write=False)
+            self.values[key] = value
+        return value
+
+    def power(self, exponent):
+        """Returns the stretch raised to the given fixed exponent."""
+        return self.get(('power', exponent), lambda: power(self.stretch, exponent))
+
+    def log(self):
+        """Returns the natural logarithm of the stretch."""
+        return self.get('log', lambda: log(self.stretch))
+
+    def i1(self):
+        """Returns the first invariant of the left Cauchy-Green tensor."""
+        def compute():
+            if self.defmode == 0:
+                return self.power(2) + 2 * self.power(-1)
+            if self.defmode == 1:
+                return 2 * self.power(2) + self.power(-4)
+            return self.power(2) + 1 + self.power(-2)
+        return self.get('i1', compute)
+
+    def i2(self):
+        """Returns the second invariant of the left Cauchy-Green tensor."""
+        def compute():
+            if self.defmode == 0:
+                return 2 * self.power(1) + self.power(-2)
+            if self.defmode == 1:
+                return self.power(4) + 2 * self.power(-2)
+            return self.power(2) + 1 + self.power(-2)
+        return self.get('i2', compute)
+
+    def lambda_chain(self):
+        """Returns the chain stretch of the eight-chain model."""
+        return self.get('lambda_chain', lambda: sqrt(self.i1() / 3))
+
+def kinematics(defmode, stretch):
+    """Returns the given Kinematics instance or a new one
+    calculated from the given stretch value or array."""
+    if isinstance(stretch, Kinematics):
+        if stretch.defmode != defmode:
+            raise ValueError('The kinematics of deformation mode ' + str(stretch.defmode) +
+                             ' do not belong to deformation mode ' + str(defmode) + '.')
+        return stretch
+    return Kinematics(defmode, stretch)
+
+def parameter_columns(params):
+    """Returns the parameters as the arguments of the model kernels.
+    A vector of size (p,) is returned as it is. The columns of a
+    matrix of size (m, p) are returned as arrays of size (m, 1), which
+    broadcast against the stretch array to stresses of size (m, n)."""
+    params = asarray(params)
+    if params.ndim == 2:
+        return list(params.T[:, :, newaxis])
+    return params
@@ -0,0 +1,46 @@
+from scipy.optimize import minimize
+from bounds import sign_bounds
+
+class LBFGSB:
+    """Minimizes the objective function with the limited-memory
+    BFGS method subject to bounds. The constraint of the model
+    must be expressible as bounds of the parameters."""
+    name = "L-BFGS-B"
+
+    def __init__(self):
+        self.calcJac = True
+        self.maxcor = 10
+        self.ftol = 1e-12
+        self.gtol = 1e-8
+        self.maxiter = 1000
+
+    def print_params(self):
+        jac_string = "Calculate Jacobian" if self.calcJac else "Estimate Jacobian"
+        return """{0}
+Maximum corrections: {1}
+Ftol: {2}
+Gtol: {3}
+Maximum iterations: {4}""".format(jac_string, self.maxcor, self.ftol,
+                                  self.gtol, self.maxiter)
+
+    def get_bounds(self):
+        return sign_bounds(self.constraint_matrix, len(self.x0))[0]
+
+    def minimize(self, callback):
+        result = minimize(self.objfunc_and_jac if self.calcJac else self.objfunc,
+                          self.x0,
+                          method='L-BFGS-B',
+                          jac=True if self.calcJac else None,
+                          bounds=self.get_bounds(),
+                          callback=callback,
+                          options={'maxcor': self.maxcor,
+                                   'ftol': self.ftol,
+                                   'gtol': self.gtol,
+                                   'maxiter': self.maxiter})
+        result.niter = result.nit
+        result.print = """Number of iterations: {0}
+Number of function evaluations: {1}
+{2}{3}""".format(result.nit, result.nfev,
+                 '' if result.success else 'Optimization failed. ',
+                 result.message)
+        return result
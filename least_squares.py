@@ -0,0 +1,178 @@
+from numpy import asarray, zeros, finfo, float64, inf
+from numpy.linalg import lstsq
+from scipy.optimize import least_squares, approx_fprime
+from finite_differences import difference_steps
+from bounds import sign_bounds
+
+def estimate_jac(fun, x):
+    """Returns the forward difference Jacobian matrix of the vector
+    function fun at x with the steps of the '2-point' scheme
+    of least_squares."""
+    return approx_fprime(x, fun, difference_steps(x, finfo(float64).eps ** 0.5))
+
+class LeastSquares:
+    """Minimizes the weighted error with scipy.optimize.least_squares.
+    The sum of squares of the stacked residual vector is the weighted
+    sum of the squared errors, not the weighted sum of the errors the
+    other methods minimize. Therefore every error is reweighted by its
+    inverse at the last solution, sum w_i f_i = sum (w_i / f_i) f_i^2,
+    and the least squares problem is solved again until the weighted
+    error stops decreasing. At that point the gradients of both
+    objectives agree.
+    The sign constraints of the model are enforced as bounds,
+    except by Levenberg-Marquardt, which does not support bounds.
+    The other constraints are not enforced. The solution fails
+    if it violates any constraint of the model."""
+    name = "Least squares"
+    method = 'trf'
+
+    def __init__(self):
+        self.ftol = 1e-8
+        self.xtol = 1e-8
+        self.gtol = 1e-8
+        self.max_nfev = None
+        self.max_reweights = 100
+        self.calcJac = True
+
+    def print_params(self):
+        jac_string = "Calculate Jacobian" if self.calcJac else "Estimate Jacobian"
+        return """{0}
+Ftol: {1}
+Xtol: {2}
+Gtol: {3}
+Maximum function evaluations: {4}""".format(jac_string, self.ftol, self.xtol,
+                                            self.gtol, self.max_nfev)
+
+    def get_bounds(self):
+        if self.method == 'lm':
+            return (-inf, inf)
+        return sign_bounds(self.constraint_matrix, len(self.x0))[0]
+
+    def solve(self, x0, scales, callback):
+        """Returns the least squares solution from x0
+        with the errors reweighted by the given scales."""
+        def jac(x, scales):
+            # least_squares has no callback. The Jacobian is evaluated
+            # once per accepted iterate, unlike the residuals, which are
+            # evaluated at rejected steps and difference probes too.
+            callback(x)
+            if self.calcJac:
+                return self.residuals_jac(x, scales)
+            return estimate_jac(lambda x: self.residuals(x, scales), x)
+
+        return least_squares(self.residuals, x0, jac=jac,
+                             bounds=self.get_bounds(),
+                             method=self.method,
+                             ftol=self.ftol, xtol=self.xtol, gtol=self.gtol,
+                             max_nfev=self.max_nfev, verbose=1,
+                             kwargs={'scales': scales})
+
+    def minimize(self, callback):
+        x = asarray(self.x0, dtype=float)
+        objf = inf
+        nfev = njev = 0
+        for nreweight in range(1, self.max_reweights + 1):
+            result = self.solve(x, self.reweight(x), callback)
+            nfev += result.nfev
+            njev += result.njev or 0
+            x = result.x
+            previous, objf = objf, self.objfunc(x)
+            if previous - objf <= self.ftol * objf:
+                break
+        result.nfev, result.njev = nfev, njev
+        result.nreweight = nreweight
+        return self.finish(result)
+
+    def finish(self, result):
+        """Sets the weighted objective and the summary of the result.
+        The result fails if it violates the constraints of the model."""
+        bounds = sign_bounds(self.constraint_matrix, len(result.x))[0]
+        if (result.x < bounds.lb).any() or (result.x > bounds.ub).any() or \
+                (asarray(self.constraint(result.x)) < 0.0).any():
+            result.success = False
+            result.message = 'The solution violates the constraints of the model.'
+        result.fun = self.objfunc(result.x)
+        result.niter = result.nfev
+        result.print = """Cost: {0:.4g}
+Optimality: {1:.4g}
+Number of reweightings: {2}
+Number of function evaluations: {3}
+Number of Jacobian evaluations: {4}
+Constraint at the solution: {5}
+{6}{7}""".format(result.cost, result.optimality, result.nreweight,
+                 result.nfev, result.njev, self.constraint(result.x),
+                 '' if result.success else 'Optimization failed. ',
+                 result.message)
+        return result
+
+class TrustRegionReflective(LeastSquares):
+    name = "Least squares (TRF)"
+    method = 'trf'
+
+class Dogbox(LeastSquares):
+    name = "Least squares (dogbox)"
+    method = 'dogbox'
+
+class LevenbergMarquardt(LeastSquares):
+    name = "Least squares (LM)"
+    method = 'lm'
+
+class VariableProjection(LeastSquares):
+    """Optimizes only the nonlinear parameters of the model with
+    least squares. The linear parameters are solved for by linear
+    least squares in every evaluation, and the Jacobian of the
+    projected residuals is approximated as proposed by Kaufman."""
+    name = "Variable projection"
+    method = 'trf'
+
+    def __init__(self):
+        LeastSquares.__init__(self)
+        self.projected = (None, None, None)
+
+    def project(self, nonlinear, scales):
+        """Returns the full parameter vector with the optimal linear
+        parameters and the Jacobian of the residuals with respect
+        to the linear parameters."""
+        key = nonlinear.tobytes() + scales.tobytes()
+        if self.projected[0] == key:
+            return self.projected[1], self.projected[2]
+        x = zeros(len(self.x0))
+        x[self.nonlinear_params] = nonlinear
+        a = self.residuals_jac(x, scales)[:, self.linear_params]
+        x[self.linear_params] = lstsq(a, -self.residuals(x, scales), rcond=None)[0]
+        self.projected = (key, x, a)
+        return x, a
+
+    def projected_residuals(self, nonlinear, scales):
+        x, a = self.project(nonlinear, scales)
+        return self.residuals(x, scales)
+
+    def projected_jac(self, nonlinear, scales):
+        x, a = self.project(nonlinear, scales)
+        jac = self.residuals_jac(x, scales)[:, self.nonlinear_params]
+        # Remove the part which the linear parameters can follow.
+        return jac - a.dot(lstsq(a, jac, rcond=None)[0])
+
+    def solve(self, x0, scales, callback):
+        def jac(nonlinear, scales):
+            # Report once per accepted iterate as in LeastSquares.
+            callback(self.project(nonlinear, scales)[0])
+            if self.calcJac:
+                return self.projected_jac(nonlinear, scales)
+            return estimate_jac(lambda x: self.projected_residuals(x, scales), nonlinear)
+
+        result = least_squares(self.projected_residuals,
+                               x0[self.nonlinear_params],
+                               jac=jac,
+                               method=self.method,
+                               ftol=self.ftol, xtol=self.xtol, gtol=self.gtol,
+                               max_nfev=self.max_nfev, verbose=1,
+                               kwargs={'scales': scales})
+        result.x = self.project(result.x, scales)[0]
+        return result
+
+    def minimize(self, callback):
+        self.projected = (None, None, None)
+        self.nonlinear_params = [i for i in range(len(self.x0))
+                                 if i not in self.linear_params]
+        return LeastSquares.minimize(self, callback)
@@ -0,0 +1,114 @@
+from numpy import asarray, zeros, argmin, inf
+from numpy.linalg import lstsq
+from scipy.linalg import null_space
+from scipy.optimize import OptimizeResult
+
+class LinearLeastSquares:
+    """Solves the least squares problem of the stacked weighted
+    residuals directly for models which are linear in their
+    parameters. The errors are reweighted and the problem is solved
+    again as in LeastSquares, so that the weighted error is minimized.
+    If the unconstrained solution violates the linear
+    constraints G x >= 0 of the model, an active set method starts
+    from the origin, where every constraint is active. It solves the
+    problem on the null space of the active constraints, stops at
+    the first constraint blocking the step to that solution and
+    makes it active, or releases the active constraint with the most
+    negative Lagrange multiplier when no constraint blocks."""
+    name = "Linear least squares"
+
+    def __init__(self):
+        self.tol = 1e-12
+        self.ftol = 1e-8
+        self.maxiter = 100
+        self.max_reweights = 100
+
+    def print_params(self):
+        return """Tol: {0}
+Ftol: {1}
+Maximum iterations: {2}""".format(self.tol, self.ftol, self.maxiter)
+
+    def solve(self, a, b, active):
+        """Returns the least squares solution of a x = b
+        where the active constraint rows are zero."""
+        if not active:
+            return lstsq(a, b, rcond=None)[0]
+        basis = null_space(asarray(self.constraint_matrix, dtype=float)[active])
+        if basis.shape[1] == 0:
+            return zeros(a.shape[1])
+        return basis.dot(lstsq(a.dot(basis), b, rcond=None)[0])
+
+    def multipliers(self, a, b, x, active):
+        """Returns the Lagrange multipliers of the active constraints,
+        whose combination of the constraint rows is the gradient
+        a^T (a x - b) of half the sum of squares."""
+        g = asarray(self.constraint_matrix, dtype=float)[active]
+        return lstsq(g.T, a.T.dot(a.dot(x) - b), rcond=None)[0]
+
+    def active_set(self, a, b):
+        """Returns the solution, the active constraints, the number of
+        iterations and whether the multipliers of the active constraints
+        are non-negative, starting from the feasible origin."""
+        g = asarray(self.constraint_matrix, dtype=float)
+        x = zeros(a.shape[1])
+        # Every constraint is active at the origin.
+        active = list(range(len(g)))
+        for niter in range(1, self.maxiter + 1):
+            z = self.solve(a, b, active)
+            values = g.dot(z)
+            tol = self.tol * max(1.0, abs(z).max())
+            blocking = [i for i in range(len(g)) if i not in active and values[i] < -tol]
+            if blocking:
+                # Go as far to z as the violated constraints allow.
+                ratios = [g[i].dot(x) / (g[i].dot(x) - values[i]) for i in blocking]
+                k = int(argmin(ratios))
+                x = x + ratios[k] * (z - x)
+                active.append(blocking[k])
+                continue
+            x = z
+            if not active:
+                return x, active, niter, True
+            multipliers = self.multipliers(a, b, x, active)
+            worst = int(argmin(multipliers))
+            if multipliers[worst] >= -self.tol * max(1.0, abs(a.T.dot(b)).max()):
+                return x, active, niter, True
+            active.pop(worst)
+        return x, active, self.maxiter, False
+
+    def solve_scaled(self, scales):
+        """Returns the solution, the active constraints, the number of
+        iterations and whether it succeeded for the errors reweighted
+        by the given scales."""
+        # The residuals are affine, their value and Jacobian
+        # at the origin define the whole problem.
+        origin = zeros(len(self.x0))
+        a = self.residuals_jac(origin, scales)
+        b = -self.residuals(origin, scales)
+        x = self.solve(a, b, [])
+        g = asarray(self.constraint_matrix, dtype=float)
+        if (g.dot(x) < -self.tol * max(1.0, abs(x).max())).any():
+            return self.active_set(a, b)
+        return x, [], 1, True
+
+    def minimize(self, callback):
+        # The first solution minimizes the weighted sum of the squared
+        # errors, the errors are then reweighted as in LeastSquares.
+        scales = None
+        objf = inf
+        niter = 0
+        for nreweight in range(1, self.max_reweights + 1):
+            x, active, n, success = self.solve_scaled(scales)
+            niter += n
+            callback(x)
+            previous, objf = objf, self.objfunc(x)
+            if not success or previous - objf <= self.ftol * objf:
+                break
+            scales = self.reweight(x)
+        message = 'Solved directly.' if success else 'Maximum number of iterations reached.'
+        result = OptimizeResult(x=x, fun=objf, success=success,
+                                niter=niter, nfev=niter, active=active,
+                                message=message)
+        result.print = """Active constraints: {0}
+Number of reweightings: {1}
+{2}{3}""".format(len(active), nreweight, '' if success else 'Optimization failed. ', message)
+        return result
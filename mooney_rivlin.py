@@ -1,4 +1,5 @@
-from numpy import power, inf, array, zeros
+from numpy import inf, array, zeros, transpose, dot
+from kinematics import kinematics, parameter_columns
 from scipy.optimize import LinearConstraint
 
 class MooneyRivlin:
@@ -10,6 +11,13 @@ class MooneyRivlin:
         self.paramnames_latex = ["C_{10}", "C_{01}"]
         self.paramcount = len(self.paramnames)
 
+        # The stress is linear in the parameters, the constraint is C10 + C01 >= 0.
+        self.linear = True
+        self.constraint_matrix = [[1.0, 1.0]]
+        # The stress is analytic in the parameters, so complex-step
+        # differentiation applies.
+        self.complex_step = True
+
     def func(self, defmode, stretch, c10, c01):
         if defmode == 0:
             return self.ut(stretch, c10, c01)
@@ -19,6 +27,36 @@ class MooneyRivlin:
             return self.ps(stretch, c10, c01)
         raise NotImplementedError
 
+    def values(self, defmode, stretch, params):
+        """Returns the stress vector of size (n,) of the Mooney-Rivlin model
+        at the stretch array of size (n,) or its Kinematics in one call.
+        For a parameter matrix of size (m, p) the stress matrix
+        of size (m, n) is returned."""
+        return self.getfunc(defmode)(kinematics(defmode, stretch), *parameter_columns(params))
+
+    def jacobian(self, defmode, stretch, params):
+        """Returns the Jacobian matrix of size (n, p) of the Mooney-Rivlin model
+        at the stretch array of size (n,) or its Kinematics in one call."""
+        return transpose(self.getjac(defmode)(kinematics(defmode, stretch), *params))
+
+    def value_and_jac(self, defmode, stretch, params):
+        """Returns the stress vector of size (n,) and the Jacobian matrix
+        of size (n, p) of the Mooney-Rivlin model at the stretch array of size (n,)
+        or its Kinematics in one call. The stress is linear in the
+        parameters, so it is the Jacobian matrix times the parameters."""
+        jacobian = self.jacobian(defmode, stretch, params)
+        return dot(jacobian, params), jacobian
+
+    def hessian(self, defmode, stretch, params):
+        """Returns the Hessian matrices of size (n, p, p) of the Mooney-Rivlin model
+        at the stretch array of size (n,) or its Kinematics in one call."""
+        return zeros((len(stretch), self.paramcount, self.paramcount))
+
+    def weighted_hessian(self, defmode, stretch, params, weights):
+        """Returns the weighted sum of size (p, p) of the Hessian matrices
+        of the Mooney-Rivlin model. The model is linear, so it is zero."""
+        return zeros((self.paramcount, self.paramcount))
+
     def getfunc(self, defmode):
         if defmode == 0:
             return self.ut
@@ -48,38 +86,48 @@ class MooneyRivlin:
 
     def ut(self, stretch, c10, c01):
         """Represents the Mooney-Rivlin model to uniaxial tension."""
-        return 2 * (power(stretch, 2) - 1 / stretch) * (c10 + c01 / stretch)
+        k = kinematics(0, stretch)
+        return 2 * (k.power(2) - k.power(-1)) * (c10 + c01 * k.power(-1))
 
     def et(self, stretch, c10, c01):
         """Represents the Mooney-Rivlin model to equibiaxial tension."""
-        return 2 * c10 * (power(stretch, 2) - power(stretch, -4)) + \
-               2 * c01 * (power(stretch, 4) - power(stretch, -2))
+        k = kinematics(1, stretch)
+        return 2 * c10 * (k.power(2) - k.power(-4)) + \
+               2 * c01 * (k.power(4) - k.power(-2))
 
     def ps(self, stretch, c10, c01):
         """Represents the Mooney-Rivlin model to pure shear."""
-        return 2 * (power(stretch, 2) - power(stretch, -2)) * (c10 + c01)
+        k = kinematics(2, stretch)
+        return 2 * (k.power(2) - k.power(-2)) * (c10 + c01)
 
     def constraint(self, x):
         """Returns the constrain of the Mooney-Rivlin model."""
         return x[0] + x[1]
 
+    def constraint_jac(self, x):
+        """Returns the Jacobian matrix of the constrain of the Mooney-Rivlin model."""
+        return array(self.constraint_matrix)
+
     def guess(self):
         return [1.0, 1.0]
 
     def ut_jac(self, stretch, c10, c01):
         """Returns the gradient vector of the Mooney-Rivlin model to uniaxial tension."""
-        return array([2 * (power(stretch, 2) - 1 / stretch),
-                      2 * (stretch - power(stretch, -2))])
+        k = kinematics(0, stretch)
+        return array([2 * (k.power(2) - k.power(-1)),
+                      2 * (k.power(1) - k.power(-2))])
 
     def et_jac(self, stretch, c10, c01):
         """Returns the gradient vector of the Mooney-Rivlin model to equibiaxial tension."""
-        return array([2 * (power(stretch, 2) - power(stretch, -4)),
-                      2 * (power(stretch, 4) - power(stretch, -2))])
+        k = kinematics(1, stretch)
+        return array([2 * (k.power(2) - k.power(-4)),
+                      2 * (k.power(4) - k.power(-2))])
 
     def ps_jac(self, stretch, c10, c01):
         """Returns the gradient vector of the Mooney-Rivlin model to pure shear."""
-        return array([2 * (power(stretch, 2) - power(stretch, -2)),
-                      2 * (power(stretch, 2) - power(stretch, -2))])
+        k = kinematics(2, stretch)
+        return array([2 * (k.power(2) - k.power(-2)),
+                      2 * (k.power(2) - k.power(-2))])
 
     def ut_hess(self, stretch, c10, c01):
         """Returns the Hessian matrix of the Mooney-Rivlin model to uniaxial tension."""
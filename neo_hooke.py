@@ -1,4 +1,5 @@
-from numpy import power, array
+from numpy import array, transpose, zeros, dot
+from kinematics import kinematics, parameter_columns
 
 class NeoHooke:
     """Represents the Neo-Hooke model."""
@@ -9,10 +10,24 @@ class NeoHooke:
         self.paramnames_latex = ['\mu']
         self.paramcount = len(self.paramnames)
 
+        # The stress is linear in mu, the constraint is mu >= 0.
+        self.linear = True
+        self.constraint_matrix = [[1.0]]
+        # The stress is analytic in the parameters, so complex-step
+        # differentiation applies.
+        self.complex_step = True
+
+    def right(self, k, c):
+        return k.power(2) - k.power(-c)
+
     def constraint(self, x):
         """Returns the constrain of the Neo-Hooke model."""
         return x[0]
 
+    def constraint_jac(self, x):
+        """Returns the Jacobian matrix of the constrain of the Neo-Hooke model."""
+        return array(self.constraint_matrix)
+
     def guess(self):
         return [1.0]
 
@@ -25,6 +40,36 @@ class NeoHooke:
             return self.ps(stretch, mu)
         raise NotImplementedError
 
+    def values(self, defmode, stretch, params):
+        """Returns the stress vector of size (n,) of the Neo-Hooke model
+        at the stretch array of size (n,) or its Kinematics in one call.
+        For a parameter matrix of size (m, p) the stress matrix
+        of size (m, n) is returned."""
+        return self.getfunc(defmode)(kinematics(defmode, stretch), *parameter_columns(params))
+
+    def jacobian(self, defmode, stretch, params):
+        """Returns the Jacobian matrix of size (n, p) of the Neo-Hooke model
+        at the stretch array of size (n,) or its Kinematics in one call."""
+        return transpose(self.getjac(defmode)(kinematics(defmode, stretch), *params))
+
+    def value_and_jac(self, defmode, stretch, params):
+        """Returns the stress vector of size (n,) and the Jacobian matrix
+        of size (n, p) of the Neo-Hooke model at the stretch array of size (n,)
+        or its Kinematics in one call. The stress is linear in the
+        parameters, so it is the Jacobian matrix times the parameters."""
+        jacobian = self.jacobian(defmode, stretch, params)
+        return dot(jacobian, params), jacobian
+
+    def hessian(self, defmode, stretch, params):
+        """Returns the Hessian matrices of size (n, p, p) of the Neo-Hooke model
+        at the stretch array of size (n,) or its Kinematics in one call."""
+        return zeros((len(stretch), self.paramcount, self.paramcount))
+
+    def weighted_hessian(self, defmode, stretch, params, weights):
+        """Returns the weighted sum of size (p, p) of the Hessian matrices
+        of the Neo-Hooke model. The model is linear, so it is zero."""
+        return zeros((self.paramcount, self.paramcount))
+
     def getfunc(self, defmode):
         if defmode == 0:
             return self.ut
@@ -54,27 +99,27 @@ class NeoHooke:
 
     def ut(self, stretch, mu):
         """Represents the Neo-Hooke model to uniaxial tension."""
-        return mu * (power(stretch, 2) - power(stretch, -1))
+        return mu * self.right(kinematics(0, stretch), 1)
 
     def et(self, stretch, mu):
         """Represents the Neo-Hooke model to equibiaxial tension."""
-        return mu * (power(stretch, 2) - power(stretch, -4))
+        return mu * self.right(kinematics(1, stretch), 4)
 
     def ps(self, stretch, mu):
         """Represents the Neo-Hooke model to pure shear."""
-        return mu * (power(stretch, 2) - power(stretch, -2))
+        return mu * self.right(kinematics(2, stretch), 2)
 
     def ut_jac(self, stretch, mu):
         """Returns the gradient vector of the Neo-Hooke model to uniaxial tension."""
-        return array([power(stretch, 2) - power(stretch, -1)])
+        return array([self.right(kinematics(0, stretch), 1)])
 
     def et_jac(self, stretch, mu):
         """Returns the gradient vector of the Neo-Hooke model to equibiaxial tension."""
-        return array([power(stretch, 2) - power(stretch, -4)])
+        return array([self.right(kinematics(1, stretch), 4)])
 
     def ps_jac(self, stretch, mu):
         """Returns the gradient vector of the Neo-Hooke model to pure shear."""
-        return array([power(stretch, 2) - power(stretch, -2)])
+        return array([self.right(kinematics(2, stretch), 2)])
 
     def ut_hess(self, stretch, mu):
         """Returns the Hessian matrix of the Neo-Hooke model to uniaxial tension."""
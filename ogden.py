@@ -1,4 +1,5 @@
-from numpy import power, log, inf, array, empty, sqrt
+from numpy import power, inf, array, zeros, sqrt, transpose, moveaxis, dot
+from kinematics import kinematics, parameter_columns
 from scipy.optimize import NonlinearConstraint
 
 class Ogden:
@@ -12,54 +13,118 @@ class Ogden:
         self.paramnames_latex = ['\\mu_{}'.format(str(k+1)) for k in range(n)] + \
                                 ['\\alpha_{}'.format(str(k+1)) for k in range(n)]
         self.paramcount = len(self.paramnames)
+        # The stress is analytic in the parameters, so complex-step
+        # differentiation applies.
+        self.complex_step = True
+        self.linear = False
+        # The stress is linear in the mu parameters.
+        self.linear_params = list(range(n))
+        # The constraint sum(mu_i * alpha_i) >= 0 is nonlinear.
+        self.constraint_matrix = None
 
-        self.jacm = empty(2 * n)
-        self.hessm = empty((2 * n, 2 * n))
-
-    def f(self, stretch, c, params):
+    def f(self, kin, c, params):
         n = self.n
+        stretch = kin.stretch
         mu = params[:n]
         alpha = params[n:]
         return 2 * sum([mu[k] / alpha[k] * (power(stretch, alpha[k]) - power(stretch, -c * alpha[k])) for k in range(n)])
 
-    def jac(self, stretch, c, params):
+    def jac(self, kin, c, params):
+        n = self.n
+        stretch = kin.stretch
+        logs = kin.log()
+        mu = params[:n]
+        alpha = params[n:]
+
+        # A new array is returned, so that the gradient works
+        # for a stretch array too and is not overwritten later.
+        return array([2 / alpha[k] * (power(stretch, alpha[k]) - power(stretch, -c * alpha[k]))
+                      for k in range(n)] +
+                     [2 * mu[k] * (-power(alpha[k], -2) * (power(stretch, alpha[k]) - power(stretch, -c * alpha[k])) +\
+                      logs / alpha[k] * (power(stretch, alpha[k]) + c * power(stretch, -c * alpha[k])))
+                      for k in range(n)])
+
+    def f_and_jac(self, kin, c, params):
         n = self.n
         mu = params[:n]
         alpha = params[n:]
+        stretch = kin.stretch
+        logs = kin.log()
 
+        # The powers of the stretch are shared by the stress
+        # and the derivatives by mu and alpha.
+        terms = []
+        dmu = []
+        dalpha = []
         for k in range(n):
-            self.jacm[k] = 2 / alpha[k] * (power(stretch, alpha[k]) - power(stretch, -c * alpha[k]))
-            self.jacm[n + k] = 2 * mu[k] * (-power(alpha[k], -2) * (power(stretch, alpha[k]) - power(stretch, -c * alpha[k])) +\
-                log(stretch) / alpha[k] * (power(stretch, alpha[k]) + c * power(stretch, -c * alpha[k])))
+            a = alpha[k]
+            p = power(stretch, a)
+            q = power(stretch, -c * a)
+            g = p - q
+            terms.append(mu[k] / a * g)
+            dmu.append(2 / a * g)
+            dalpha.append(2 * mu[k] * (-power(a, -2) * g + logs / a * (p + c * q)))
+        return 2 * sum(terms), array(dmu + dalpha)
 
-    def hess(self, stretch, c, params):
-        raise NotImplementedError()
+    def hess(self, kin, c, params):
         n = self.n
         mu = params[:n]
         alpha = params[n:]
-        
-        for i in range(n):
-            for j in range(n):
-                self.hessm[i, j] = 0.0
-                if i == j:
-                    self.hessm[n + i, n + j] = 2 * mu[i] * power(log(stretch), 2) * \
-                        (power(stretch, alpha[i] - 1) - power(c, 2) * power(stretch, -c * alpha[i] - 1))
-                    self.hessm[n + i, j] = 2 * log(stretch) * \
-                        (power(stretch, alpha[i] - 1) + c * power(stretch, -c * alpha[i] - 1))
-                    self.hessm[i, n + j] = self.hessm[n + i, j]
-                else:
-                    self.hessm[n + i, n + j] = 0.0
-                    self.hessm[n + i, j] = 0.0
-                    self.hessm[i, n + j] = 0.0
+        stretch = kin.stretch
+        logs = kin.log()
+
+        # Only the derivatives of the same term are non-zero.
+        result = zeros((2 * n, 2 * n) + stretch.shape)
+        for k in range(n):
+            a = alpha[k]
+            p = power(stretch, a)
+            q = power(stretch, -c * a)
+            g = p - q
+            g1 = logs * (p + c * q)
+            g2 = logs * logs * (p - c * c * q)
+            result[k, n + k] = result[n + k, k] = 2 * (g1 / a - g / a ** 2)
+            result[n + k, n + k] = 2 * mu[k] * (g2 / a - 2 * g1 / a ** 2 + 2 * g / a ** 3)
+        return result
+
+    def weighted_hess(self, kin, c, params, weights):
+        n = self.n
+        mu = params[:n]
+        alpha = params[n:]
+        stretch = kin.stretch
+        logs = kin.log()
+
+        # The same terms as in hess, but every term is summed
+        # over the stretch values as soon as it is calculated.
+        result = zeros((2 * n, 2 * n))
+        for k in range(n):
+            a = alpha[k]
+            p = power(stretch, a)
+            q = power(stretch, -c * a)
+            g = p - q
+            g1 = logs * (p + c * q)
+            g2 = logs * logs * (p - c * c * q)
+            result[k, n + k] = result[n + k, k] = 2 * dot(weights, g1 / a - g / a ** 2)
+            result[n + k, n + k] = 2 * mu[k] * dot(weights, g2 / a - 2 * g1 / a ** 2 + 2 * g / a ** 3)
+        return result
 
     def constraint(self, x):
         """Returns the constrain of the Ogden model."""
         n = self.n
         return [sum([x[i] * x[n + i] for i in range(n)])]
 
+    def constraint_jac(self, x):
+        """Returns the Jacobian matrix of the constrain of the Ogden model."""
+        n = self.n
+        return array([list(x[n:]) + list(x[:n])], dtype=float)
+
     def guess(self):
         return [1.0] * (2 * self.n)
 
+    def guess_nonlinear(self):
+        """Returns distinct initial alpha parameters for fits
+        which solve for the mu parameters."""
+        return [2.0 * (k // 2 + 1) * (-1) ** k for k in range(self.n)]
+
     def func(self, defmode, stretch, *params):
         if defmode == 0:
             return self.ut(stretch, *params)
@@ -69,6 +134,37 @@ class Ogden:
             return self.ps(stretch, *params)
         raise NotImplementedError
 
+    def values(self, defmode, stretch, params):
+        """Returns the stress vector of size (n,) of the Ogden model
+        at the stretch array of size (n,) or its Kinematics in one call.
+        For a parameter matrix of size (m, p) the stress matrix
+        of size (m, n) is returned."""
+        return self.getfunc(defmode)(kinematics(defmode, stretch), *parameter_columns(params))
+
+    def jacobian(self, defmode, stretch, params):
+        """Returns the Jacobian matrix of size (n, p) of the Ogden model
+        at the stretch array of size (n,) or its Kinematics in one call."""
+        return transpose(self.getjac(defmode)(kinematics(defmode, stretch), *params))
+
+    def value_and_jac(self, defmode, stretch, params):
+        """Returns the stress vector of size (n,) and the Jacobian matrix
+        of size (n, p) of the Ogden model at the stretch array of size (n,)
+        or its Kinematics in one call."""
+        value, jac = self.getvalueandjac(defmode)(kinematics(defmode, stretch), *params)
+        return value, transpose(jac)
+
+    def hessian(self, defmode, stretch, params):
+        """Returns the Hessian matrices of size (n, p, p) of the Ogden model
+        at the stretch array of size (n,) or its Kinematics in one call."""
+        return moveaxis(self.gethess(defmode)(kinematics(defmode, stretch), *params), -1, 0)
+
+    def weighted_hessian(self, defmode, stretch, params, weights):
+        """Returns the sum of size (p, p) of the Hessian matrices of the
+        Ogden model at the stretch array of size (n,) or its Kinematics,
+        weighted by the array of size (n,). The Hessian matrices
+        of size (n, p, p) are not built."""
+        return self.getweightedhess(defmode)(kinematics(defmode, stretch), weights, *params)
+
     def getfunc(self, defmode):
         if defmode == 0:
             return self.ut
@@ -87,6 +183,15 @@ class Ogden:
             return self.ps_jac
         raise NotImplementedError
 
+    def getvalueandjac(self, defmode):
+        if defmode == 0:
+            return self.ut_value_and_jac
+        if defmode == 1:
+            return self.et_value_and_jac
+        if defmode == 2:
+            return self.ps_value_and_jac
+        raise NotImplementedError
+
     def gethess(self, defmode):
         if defmode == 0:
             return self.ut_hess
@@ -96,44 +201,71 @@ class Ogden:
             return self.ps_hess
         raise NotImplementedError
 
+    def getweightedhess(self, defmode):
+        if defmode == 0:
+            return self.ut_weighted_hess
+        if defmode == 1:
+            return self.et_weighted_hess
+        if defmode == 2:
+            return self.ps_weighted_hess
+        raise NotImplementedError
+
     def ut(self, stretch, *params):
         """Represents the Ogden model to uniaxial tension."""
-        return self.f(stretch, 0.5, params)
+        return self.f(kinematics(0, stretch), 0.5, params)
 
     def et(self, stretch, *params):
         """Represents the Ogden model to equibiaxial tension."""
-        return self.f(stretch, 2.0, params)
+        return self.f(kinematics(1, stretch), 2.0, params)
 
     def ps(self, stretch, *params):
         """Represents the Ogden model to pure shear."""
-        return self.f(stretch, 1.0, params)
+        return self.f(kinematics(2, stretch), 1.0, params)
 
     def ut_jac(self, stretch, *params):
         """Returns the gradient vector of the Ogden model to uniaxial tension."""
-        self.jac(stretch, 0.5, params)
-        return self.jacm
+        return self.jac(kinematics(0, stretch), 0.5, params)
 
     def et_jac(self, stretch, *params):
         """Returns the gradient vector of the Ogden model to equibiaxial tension."""
-        self.jac(stretch, 2.0, params)
-        return self.jacm
+        return self.jac(kinematics(1, stretch), 2.0, params)
 
     def ps_jac(self, stretch, *params):
         """Returns the gradient vector of the Ogden model to pure shear."""
-        self.jac(stretch, 1.0, params)
-        return self.jacm
+        return self.jac(kinematics(2, stretch), 1.0, params)
+
+    def ut_value_and_jac(self, stretch, *params):
+        """Returns the stress and the gradient vector of the Ogden model to uniaxial tension."""
+        return self.f_and_jac(kinematics(0, stretch), 0.5, params)
+
+    def et_value_and_jac(self, stretch, *params):
+        """Returns the stress and the gradient vector of the Ogden model to equibiaxial tension."""
+        return self.f_and_jac(kinematics(1, stretch), 2.0, params)
+
+    def ps_value_and_jac(self, stretch, *params):
+        """Returns the stress and the gradient vector of the Ogden model to pure shear."""
+        return self.f_and_jac(kinematics(2, stretch), 1.0, params)
 
     def ut_hess(self, stretch, *params):
         """Returns the Hessian matrix of the Ogden model to uniaxial tension."""
-        self.hess(stretch, 0.5, params)
-        return self.jacm
+        return self.hess(kinematics(0, stretch), 0.5, params)
 
     def et_hess(self, stretch, *params):
         """Returns the Hessian matrix of the Ogden model to equibiaxial tension."""
-        self.hess(stretch, 2.0, params)
-        return self.jacm
+        return self.hess(kinematics(1, stretch), 2.0, params)
 
     def ps_hess(self, stretch, *params):
         """Returns the Hessian matrix of the Ogden model to pure shear."""
-        self.hess(stretch, 1.0, params)
-        return self.jacm
\ No newline at end of file
+        return self.hess(kinematics(2, stretch), 1.0, params)
+
+    def ut_weighted_hess(self, stretch, weights, *params):
+        """Returns the weighted sum of the Hessian matrices of the Ogden model to uniaxial tension."""
+        return self.weighted_hess(kinematics(0, stretch), 0.5, params, weights)
+
+    def et_weighted_hess(self, stretch, weights, *params):
+        """Returns the weighted sum of the Hessian matrices of the Ogden model to equibiaxial tension."""
+        return self.weighted_hess(kinematics(1, stretch), 2.0, params, weights)
+
+    def ps_weighted_hess(self, stretch, weights, *params):
+        """Returns the weighted sum of the Hessian matrices of the Ogden model to pure shear."""
+        return self.weighted_hess(kinematics(2, stretch), 1.0, params, weights)
\ No newline at end of file
@@ -46,7 +46,7 @@ class PdfGenerator:
                     for defmode in range(3):
                         if self.plot_defmode[defmode]:
                             filenames.add_item(self.titles[defmode] \
-                                + ': ' + self.filenames[defmode])
+                                + ': ' + self.datasets[defmode].filename)
                 input.add_item("Weights:")
                 with doc.create(Itemize()) as weights:
                     for defmode in range(3):
@@ -68,10 +68,9 @@ class PdfGenerator:
                     for defmode in range(3):
                         if not self.plot_defmode[defmode]:
                             continue
-                        error = self.fit_error(self.model.getfunc(defmode),
-                                               self.model.getjac(defmode),
-                                               self.model.gethess(defmode),
-                                               self.xdatas[defmode], self.ydatas[defmode])
+                        error = self.fit_error(self.model, defmode,
+                                               self.datasets[defmode].stretch,
+                                               self.datasets[defmode].stress)
                         errval = error.objfunc(self.params)
                         weighted_error += errval * self.weights[defmode]
                         errorlist.add_item('{}: {:.4g}'.format(self.titles[defmode], errval))
@@ -90,14 +89,14 @@ class PdfGenerator:
 
         for defmode in range(3):
             # Plot read data as points.
-            if self.xdatas[defmode] is None or not self.plot_defmode[defmode]:
+            dataset = self.datasets[defmode]
+            if dataset is None or not self.plot_defmode[defmode]:
                 continue
             
-            xdata = self.plot_deformation.from_stretch(self.xdatas[defmode])
-            ydata = self.plot_stress.from_true_stress(self.ydatas[defmode], self.xdatas[defmode])
-            error = self.plot_error(self.model.getfunc(defmode), self.model.getjac(defmode),
-                                    self.model.gethess(defmode),
-                                    self.xdatas[defmode], self.ydatas[defmode])
+            xdata = self.plot_deformation.from_stretch(dataset.stretch)
+            ydata = self.plot_stress.from_true_stress(dataset.stress, dataset.stretch)
+            error = self.plot_error(self.model, defmode,
+                                    dataset.stretch, dataset.stress)
 
             label = self.titles[defmode]
             label += ' - ${}$ = {:.4g}'.format(self.plot_error.name_latex, error.objfunc(self.params))
@@ -1,59 +1,154 @@
-from numpy import array, zeros, sqrt, matmul, transpose
+from numpy import asarray, dot, sqrt, outer
+from evaluation_cache import EvaluationCache
+from kinematics import Kinematics
 
 class RMSAE:
     name = "Root Mean Squared Absolute Error"
     shortname = "RMSAE"
     name_latex = '\\Delta_{RMSA}'
 
-    def __init__(self, func, jac, hess, xdata, ydata):
+    def __init__(self, model, defmode, xdata, ydata, kinematics=None):
         """Initializes a RRMSAE instance whose objective function
         calculates the square root of the mean squared error
         between the given data points and the function.
         ----------
         Keyword arguments:
-        func -- Function should have syntax func(x, *params).
-        jac -- A callable calculating the gradient vector
-               of the function.
-        hess -- A callable calculating the Hessian matrix
-                of the function.
-        xdata -- The list of x coordinates of size (n,).
-        ydata -- The list of y coordinates of size (n,).
+        model -- The model whose values, jacobian and hessian
+                 methods are evaluated on the whole data at once.
+        defmode -- The deformation mode (0: UT, 1: ET, 2: PS).
+        xdata -- The array of x coordinates of size (n,).
+        ydata -- The array of y coordinates of size (n,).
+        kinematics -- The Kinematics of xdata, e.g. of the dataset.
+                      They are calculated here if not given or
+                      if samples at the origin are removed.
         """
-        self.func = func
-        self.fjac = jac
-        self.fhess = hess
-
-        length = len(xdata)
-        not_origin_index = [y != 0.0 for y in ydata]
-        self.data = list(zip([xdata[i] for i in range(length) if not_origin_index[i]],
-                             [ydata[i] for i in range(length) if not_origin_index[i]]))
-        self.n = len(self.data)
+        self.model = model
+        self.defmode = defmode
+        self.cache = EvaluationCache()
+
+        xdata, ydata = asarray(xdata), asarray(ydata)
+        not_origin_index = ydata != 0.0
+        if not not_origin_index.all():
+            xdata, ydata = xdata[not_origin_index], ydata[not_origin_index]
+        self.x, self.y = xdata, ydata
+        if kinematics is None or kinematics.stretch is not self.x:
+            kinematics = Kinematics(defmode, self.x)
+        self.kinematics = kinematics
+        self.n = len(self.x)
+        self.sqrtn = sqrt(self.n)
+
+    def differences(self, params):
+        """Returns the differences between the function and the data."""
+        return self.cache.get(params, 'differences', lambda:
+            self.model.values(self.defmode, self.kinematics, params) - self.y)
+
+    def model_jac(self, params):
+        """Returns the Jacobian matrix of the function."""
+        return self.cache.get(params, 'model_jac', lambda:
+            self.model.jacobian(self.defmode, self.kinematics, params))
+
+    def differences_and_jac(self, params):
+        """Returns the differences and the Jacobian matrix of the
+        function. Unless the differences are cached already, both
+        come from one evaluation of the model."""
+        def compute():
+            values, jacobian = self.model.value_and_jac(self.defmode, self.kinematics, params)
+            self.cache.put(params, 'model_jac', jacobian)
+            return values - self.y
+        return self.cache.get(params, 'differences', compute), self.model_jac(params)
+
+    def weighted_model_hess(self, params):
+        """Returns the sum of the Hessian matrices of the function
+        weighted by the residuals, which the model sums up term by
+        term without building the Hessian matrix of every sample."""
+        return self.cache.get(params, 'weighted_model_hess', lambda:
+            self.model.weighted_hessian(self.defmode, self.kinematics, params,
+                                        self.differences(params)))
+
+    def residuals(self, params):
+        """Returns the residual vector whose sum of squares
+        is the square of the objective function."""
+        return self.differences(params) / self.sqrtn
+
+    def residuals_jac(self, params):
+        """Returns the Jacobian matrix of size (n, p) of the residuals."""
+        return self.model_jac(params) / self.sqrtn
     
     def objfunc(self, params):
         """Returns the RMSAE when the parameters are applied."""
-        error = 0
-        for x, y in self.data:
-            f = self.func(x, *params)
-            abserr = f - y
-            error += abserr ** 2
-        return sqrt(error / self.n)
+        def compute():
+            r = self.differences(params)
+            return sqrt(dot(r, r) / self.n)
+        return self.cache.get(params, 'objfunc', compute)
     
+    def objfunc_batch(self, params):
+        """Returns the RMSAE of size (m,) at the rows of a parameter
+        matrix of size (m, p) from one model evaluation. The squares
+        are not conjugated, so complex parameters give the complex
+        step derivative."""
+        r = self.model.values(self.defmode, self.kinematics, params) - self.y
+        return sqrt((r * r).sum(axis=1) / self.n)
+
     def jac(self, params):
         """Calculates the gradient vector of the objective function
         when the parameters are applied."""
-        result = zeros(len(params))
-        for x, y in self.data:
-            result += (self.func(x, *params) - y) * self.fjac(x, *params)
-        return result / (self.n * self.objfunc(params))
+        def compute():
+            r, fj = self.differences_and_jac(params)
+            return dot(r, fj) / (self.n * self.objfunc(params))
+        return self.cache.get(params, 'jac', compute)
+
+    def objfunc_and_jac(self, params):
+        """Returns the RMSAE and its gradient vector
+        when the parameters are applied."""
+        # The gradient first, so that the differences come
+        # from the same model evaluation as the Jacobian matrix.
+        jacobian = self.jac(params)
+        return self.objfunc(params), jacobian
     
     def hess(self, params):
         """Calculates the Hessian matrix of the objective function
         when the parameters are applied."""
-        result = zeros((len(params), len(params)))
-        for x, y in self.data:
-            fj = self.fjac(x, *params)
-            result += matmul(fj, transpose(fj)) + (self.func(x, *params) - y) * self.fhess(x, *params)
+        return self.cache.get(params, 'hess', lambda:
+            self.assemble_hess(params, True))
+
+    def gauss_newton_hess(self, params):
+        """Calculates the Gauss-Newton approximation of the Hessian
+        matrix of the objective function, which neglects the second
+        derivatives of the model. It is positive semidefinite."""
+        return self.cache.get(params, 'gauss_newton_hess', lambda:
+            self.assemble_hess(params, False))
+
+    def assemble_hess(self, params, second_order):
+        """Returns the Hessian matrix of size (p, p) of the objective
+        function, (J^T J + sum r_i H_i) / (n f) - g g^T / f, where the
+        model Hessians H_i are left out unless second_order is set."""
+        fj = self.model_jac(params)
+        result = dot(fj.T, fj)
+        if second_order:
+            result += self.weighted_model_hess(params)
+        objf = self.objfunc(params)
         jacobian = self.jac(params)
+        return result / (self.n * objf) - outer(jacobian, jacobian) / objf
+
+    def hessp(self, params, v):
+        """Calculates the product of the Hessian matrix of the objective
+        function with the vector v without building the matrix."""
+        return self.assemble_hessp(params, v, True)
+
+    def gauss_newton_hessp(self, params, v):
+        """Calculates the product of the Gauss-Newton approximation of
+        the Hessian matrix with the vector v without building it."""
+        return self.assemble_hessp(params, v, False)
+
+    def assemble_hessp(self, params, v, second_order):
+        """Returns the product of the Hessian matrix of assemble_hess
+        with the vector v of size (p,). Only the small weighted sum of
+        the model Hessians is kept, the Jacobian matrix is multiplied
+        by vectors."""
+        fj = self.model_jac(params)
+        result = dot(dot(fj, v), fj)
+        if second_order:
+            result += dot(self.weighted_model_hess(params), v)
         objf = self.objfunc(params)
-        r = result / (self.n * objf) - matmul(jacobian, transpose(jacobian)) / objf
-        return r
+        jacobian = self.jac(params)
+        return result / (self.n * objf) - jacobian * (dot(jacobian, v) / objf)
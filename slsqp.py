@@ -1,26 +1,41 @@
-from scipy.optimize import minimize, OptimizeResult
+from numpy import inf
+from scipy.optimize import minimize, OptimizeResult, LinearConstraint
+from bounds import sign_bounds
 
 class Slsqp:
     name = "SLSQP"
 
     def __init__(self):
+        self.calcJac = True
         self.tol = None
         self.maxiter = 100
         self.ftol = 1e-6
         self.eps = 1.4901161193847656e-08
 
     def print_params(self):
-        return """Tol: {0}
-Maximum iterations: {1}
-Ftol: {2}
-Eps: {3}""".format(self.tol, self.maxiter, self.ftol, self.eps)
+        jac_string = "Calculate Jacobian" if self.calcJac else "Estimate Jacobian"
+        return """{0}
+Tol: {1}
+Maximum iterations: {2}
+Ftol: {3}
+Eps: {4}""".format(jac_string, self.tol, self.maxiter, self.ftol, self.eps)
+
+    def get_bounds(self):
+        return sign_bounds(self.constraint_matrix, len(self.x0))[0]
 
     def get_constraint(self):
-        return {'type': 'ineq', 'fun': self.constraint}
+        if self.constraint_matrix is not None:
+            # The sign constraints are passed as bounds.
+            rows = sign_bounds(self.constraint_matrix, len(self.x0))[1]
+            return [LinearConstraint(rows, 0, inf)] if rows else []
+        return {'type': 'ineq', 'fun': self.constraint, 'jac': self.constraint_jac}
 
     def minimize(self, callback):
-        result = minimize(self.objfunc, self.x0,
+        result = minimize(self.objfunc_and_jac if self.calcJac else self.objfunc,
+                    self.x0,
                     method='SLSQP',
+                    jac=True if self.calcJac else None,
+                    bounds=self.get_bounds(),
                     constraints=self.get_constraint(),
                     tol=self.tol, callback=callback,
                     options={'maxiter': self.maxiter,
@@ -29,7 +44,8 @@ Eps: {3}""".format(self.tol, self.maxiter, self.ftol, self.eps)
                              'disp': True})
         result.niter = 1
         result.print = """Number of function evaluations: {0}
-{1}{2}""".format(result.nfev,
+Number of gradient evaluations: {1}
+{2}{3}""".format(result.nfev, result.njev,
                  '' if result.success else 'Optimization failed. ',
                  result.message)
         return result
@@ -0,0 +1,48 @@
+from scipy.optimize import minimize
+from bounds import sign_bounds
+
+class TNC:
+    """Minimizes the objective function with the truncated Newton
+    method subject to bounds. The constraint of the model must be
+    expressible as bounds of the parameters."""
+    name = "TNC"
+
+    def __init__(self):
+        self.calcJac = True
+        self.ftol = 1e-12
+        # The parameters differ by orders of magnitude,
+        # so the step length is no stopping criterion.
+        self.xtol = 0.0
+        self.gtol = 1e-8
+        self.maxfun = 1000
+
+    def print_params(self):
+        jac_string = "Calculate Jacobian" if self.calcJac else "Estimate Jacobian"
+        return """{0}
+Ftol: {1}
+Xtol: {2}
+Gtol: {3}
+Maximum function evaluations: {4}""".format(jac_string, self.ftol, self.xtol,
+                                            self.gtol, self.maxfun)
+
+    def get_bounds(self):
+        return sign_bounds(self.constraint_matrix, len(self.x0))[0]
+
+    def minimize(self, callback):
+        result = minimize(self.objfunc_and_jac if self.calcJac else self.objfunc,
+                          self.x0,
+                          method='TNC',
+                          jac=True if self.calcJac else None,
+                          bounds=self.get_bounds(),
+                          callback=callback,
+                          options={'ftol': self.ftol,
+                                   'xtol': self.xtol,
+                                   'gtol': self.gtol,
+                                   'maxfun': self.maxfun})
+        result.niter = result.nit
+        result.print = """Number of iterations: {0}
+Number of function evaluations: {1}
+{2}{3}""".format(result.nit, result.nfev,
+                 '' if result.success else 'Optimization failed. ',
+                 result.message)
+        return result
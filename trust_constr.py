@@ -17,7 +17,16 @@ class TrustConstr:
 
     def print_params(self):
         jac_string = "Calculate Jacobian" if self.calcJac else "Estimate Jacobian"
-        hess_string = "Calculate Hessian" if self.calcHess else "Estimate Hessian"
+        if not self.calcJac and not isinstance(self.jac, str):
+            jac_string += " (batched)"
+        if not self.calcHess:
+            hess_string = "Estimate Hessian"
+        elif self.gaussNewton:
+            hess_string = "Gauss-Newton Hessian"
+        else:
+            hess_string = "Calculate Hessian"
+        if self.calcHess and self.useHessp:
+            hess_string += " (Hessian-vector products)"
         return """{0}
 {1}
 Xtol: {2}
@@ -35,13 +44,23 @@ Initial barrier tolerance: {9}""".format(jac_string, hess_string, self.xtol, sel
                                          self.initial_barrier_tolerance)
 
     def get_constraint(self):
+        # The constraint derivatives are estimated by scipy. Passing
+        # the constraint as linear or with its exact derivatives
+        # changes the barrier steps and stalls the Arruda-Boyce and
+        # Ogden fits of the bundled data far from their minimum.
         return NonlinearConstraint(self.constraint, 0, inf)
 
     def minimize(self, callback):
+        if self.calcHess and self.useHessp:
+            # The conjugate gradient iterations only need products
+            # of the Hessian matrix with vectors.
+            hess, hessp = None, self.hessp
+        else:
+            hess, hessp = self.hess, None
         result = minimize(self.objfunc, self.x0,
                         method='trust-constr',
                         constraints=self.get_constraint(),
-                        jac=self.jac, hess=self.hess,
+                        jac=self.jac, hess=hess, hessp=hessp,
                         callback=callback,
                         options={'xtol': self.xtol, 'gtol': self.gtol,
                                  'barrier_tol': self.barrier_tol, 
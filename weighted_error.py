@@ -1,4 +1,4 @@
-from numpy import array, dot, empty, sqrt
+from numpy import array, dot, empty, sqrt, concatenate, vstack, where
 
 class WeightedError:
     def __init__(self, errors, weights):
@@ -19,6 +19,14 @@ class WeightedError:
             error += err.objfunc(params) * weight
         return error
     
+    def objfunc_batch(self, params):
+        """Returns the weighted errors of size (m,) at the rows
+        of a parameter matrix of size (m, p)."""
+        error = 0
+        for err, weight in self.factors:
+            error = error + err.objfunc_batch(params) * weight
+        return error
+
     def jac(self, params):
         """Calculates the gradient vector of the objective function
         when the parameters are applied."""
@@ -27,10 +35,89 @@ class WeightedError:
             result += err.jac(params) * weight
         return result
     
+    def objfunc_and_jac(self, params):
+        """Returns the weighted error and its gradient vector, each
+        error evaluates its model and Jacobian matrix only once."""
+        error = 0
+        result = array([0.0] * len(params))
+        for err, weight in self.factors:
+            objf, jacobian = err.objfunc_and_jac(params)
+            error += objf * weight
+            result += jacobian * weight
+        return error, result
+
     def hess(self, params):
         """Calculates the Hessian matrix of the objective function
         when the parameters are applied."""
-        r = array([[sum(error.hess(params)[i, j] * weight \
-            for error, weight in self.factors) \
-            for i in range(len(params))] for j in range(len(params))])
-        return r
+        result = empty((len(params), len(params)))
+        result.fill(0.0)
+        for err, weight in self.factors:
+            result += err.hess(params) * weight
+        return result
+
+    def gauss_newton_hess(self, params):
+        """Calculates the Gauss-Newton approximation of the Hessian
+        matrix of the objective function, which needs no second
+        derivatives of the model."""
+        result = empty((len(params), len(params)))
+        result.fill(0.0)
+        for err, weight in self.factors:
+            result += err.gauss_newton_hess(params) * weight
+        return result
+
+    def hessp(self, params, v):
+        """Calculates the product of the Hessian matrix of the
+        objective function with the vector v."""
+        result = array([0.0] * len(params))
+        for err, weight in self.factors:
+            result += err.hessp(params, v) * weight
+        return result
+
+    def gauss_newton_hessp(self, params, v):
+        """Calculates the product of the Gauss-Newton approximation
+        of the Hessian matrix with the vector v."""
+        result = array([0.0] * len(params))
+        for err, weight in self.factors:
+            result += err.gauss_newton_hessp(params, v) * weight
+        return result
+
+    def reweight(self, params):
+        """Returns the scales of the weights of the errors, the inverse
+        of the errors when the parameters are applied. The sum of the
+        squared errors reweighted by them is the weighted error there,
+        sum w_i f_i = sum (w_i / f_i) f_i^2. An error which vanishes
+        keeps its weight."""
+        errors = array([err.objfunc(params) for err, weight in self.factors])
+        return where(errors > 0.0, 1.0 / where(errors > 0.0, errors, 1.0), 1.0)
+
+    def residuals(self, params, scales=None):
+        """Returns the residuals of the errors scaled by the square
+        root of their weights and stacked into one vector. Its sum of
+        squares is the weighted sum of the squared errors, which is
+        what least squares methods minimize.
+        ----------
+        Keyword arguments:
+        params -- The parameters of the model.
+        scales -- The factors of the weights of the errors, e.g. to
+                  reweight the squared errors. None leaves them as is.
+        """
+        if scales is None:
+            scales = [1.0] * len(self.factors)
+        return concatenate([err.residuals(params) * sqrt(weight * scale)
+                            for (err, weight), scale in zip(self.factors, scales)])
+
+    def residuals_jac(self, params, scales=None):
+        """Returns the Jacobian matrix of size (n, p) of the stacked
+        residuals, where n is the total number of data points.
+        The scales are those of residuals."""
+        if scales is None:
+            scales = [1.0] * len(self.factors)
+        return vstack([err.residuals_jac(params) * sqrt(weight * scale)
+                       for (err, weight), scale in zip(self.factors, scales)])
+
+    def cache_counters(self):
+        """Returns the total number of hits and misses
+        of the evaluation caches of the errors."""
+        hits = sum(err.cache.hits for err, weight in self.factors)
+        misses = sum(err.cache.misses for err, weight in self.factors)
+        return hits, misses
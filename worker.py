@@ -0,0 +1,50 @@
+import queue
+import threading
+
+class Cancelled(Exception):
+    """Raised by the progress callback of a cancelled Worker."""
+    pass
+
+class Worker(threading.Thread):
+    """Runs a task in a background thread. The progress, the result
+    and the error of the task are passed to the Tk thread through
+    a thread-safe queue, which the Tk thread polls."""
+
+    def __init__(self, task):
+        """Initializes a Worker instance.
+        ----------
+        Keyword arguments:
+        task -- The callable to run. It is called with the progress
+                callback, which it should call regularly.
+        """
+        threading.Thread.__init__(self, daemon=True)
+        self.task = task
+        self.queue = queue.Queue()
+        self.cancelled = threading.Event()
+
+    def progress(self, stage, done, total):
+        """Reports the progress of the task. Raises Cancelled
+        if the task has been cancelled.
+        ----------
+        Keyword arguments:
+        stage -- The name of the current stage.
+        done -- The amount of work done in the stage.
+        total -- The total amount of work in the stage.
+        """
+        if self.cancelled.is_set():
+            raise Cancelled()
+        self.queue.put(('progress', (stage, done, total)))
+
+    def cancel(self):
+        """Asks the task to stop at its next progress report."""
+        self.cancelled.set()
+
+    def run(self):
+        try:
+            result = self.task(self.progress)
+        except Cancelled:
+            self.queue.put(('cancelled', None))
+        except Exception as err:
+            self.queue.put(('error', err))
+        else:
+            self.queue.put(('done', result))
@@ -1,4 +1,5 @@
-from numpy import power, array, zeros
+from numpy import power, array, zeros, transpose, dot
+from kinematics import kinematics, parameter_columns
 
 class Yeoh:
     """Represents the Yeoh model."""
@@ -9,23 +10,23 @@ class Yeoh:
         self.paramnames_latex = ['C_{10}', 'C_{20}', 'C_{30}']
         self.paramcount = len(self.paramnames)
 
-    def i1ut(self, stretch):
-        return power(stretch, 2) + 2 / stretch
+        # The stress is linear in the parameters, the constraint is C10 >= 0.
+        self.linear = True
+        self.constraint_matrix = [[1.0, 0.0, 0.0]]
+        # The stress is analytic in the parameters, so complex-step
+        # differentiation applies.
+        self.complex_step = True
 
-    def i1et(self, stretch):
-        return 2 * power(stretch, 2) + power(stretch, -4)
+    def a(self, k, c):
+        return k.power(2) - k.power(-c)
 
-    def i1ps(self, stretch):
-        return power(stretch, 2) + 1 + power(stretch, -2)
+    def f(self, k, c, c10, c20, c30):
+        i1 = k.i1()
+        return 2 * (c10 + 2 * c20 * (i1 - 3) + 3 * c30 * power(i1 - 3, 2)) * self.a(k, c)
 
-    def a(self, stretch, c):
-        return power(stretch, 2) - power(stretch, -c)
-
-    def f(self, stretch, c, i1, c10, c20, c30):
-        return 2 * (c10 + 2 * c20 * (i1 - 3) + 3 * c30 * power(i1 - 3, 2)) * self.a(stretch, c)
-
-    def jac(self, stretch, c, i1):
-        a = self.a(stretch, c)
+    def jac(self, k, c):
+        a = self.a(k, c)
+        i1 = k.i1()
         return array([2 * a,
                 4 * (i1 - 3) * a,
                 6 * power(i1 - 3, 2) * a])
@@ -34,6 +35,10 @@ class Yeoh:
         """Returns the constrain of the Yeoh model."""
         return x[0]
 
+    def constraint_jac(self, x):
+        """Returns the Jacobian matrix of the constrain of the Yeoh model."""
+        return array(self.constraint_matrix)
+
     def guess(self):
         return [1.0, 1.0, 1.0]
 
@@ -46,6 +51,36 @@ class Yeoh:
             return self.ps(stretch, c10, c20, c30)
         raise NotImplementedError
 
+    def values(self, defmode, stretch, params):
+        """Returns the stress vector of size (n,) of the Yeoh model
+        at the stretch array of size (n,) or its Kinematics in one call.
+        For a parameter matrix of size (m, p) the stress matrix
+        of size (m, n) is returned."""
+        return self.getfunc(defmode)(kinematics(defmode, stretch), *parameter_columns(params))
+
+    def jacobian(self, defmode, stretch, params):
+        """Returns the Jacobian matrix of size (n, p) of the Yeoh model
+        at the stretch array of size (n,) or its Kinematics in one call."""
+        return transpose(self.getjac(defmode)(kinematics(defmode, stretch), *params))
+
+    def value_and_jac(self, defmode, stretch, params):
+        """Returns the stress vector of size (n,) and the Jacobian matrix
+        of size (n, p) of the Yeoh model at the stretch array of size (n,)
+        or its Kinematics in one call. The stress is linear in the
+        parameters, so it is the Jacobian matrix times the parameters."""
+        jacobian = self.jacobian(defmode, stretch, params)
+        return dot(jacobian, params), jacobian
+
+    def hessian(self, defmode, stretch, params):
+        """Returns the Hessian matrices of size (n, p, p) of the Yeoh model
+        at the stretch array of size (n,) or its Kinematics in one call."""
+        return zeros((len(stretch), self.paramcount, self.paramcount))
+
+    def weighted_hessian(self, defmode, stretch, params, weights):
+        """Returns the weighted sum of size (p, p) of the Hessian matrices
+        of the Yeoh model. The model is linear, so it is zero."""
+        return zeros((self.paramcount, self.paramcount))
+
     def getfunc(self, defmode):
         if defmode == 0:
             return self.ut
@@ -75,27 +110,27 @@ class Yeoh:
 
     def ut(self, stretch, c10, c20, c30):
         """Represents the Yeoh model to uniaxial tension."""
-        return self.f(stretch, 1, self.i1ut(stretch), c10, c20, c30)
+        return self.f(kinematics(0, stretch), 1, c10, c20, c30)
 
     def et(self, stretch, c10, c20, c30):
         """Represents the Yeoh model to equibiaxial tension."""
-        return self.f(stretch, 4, self.i1et(stretch), c10, c20, c30)
+        return self.f(kinematics(1, stretch), 4, c10, c20, c30)
 
     def ps(self, stretch, c10, c20, c30):
         """Represents the Yeoh model to pure shear."""
-        return self.f(stretch, 2, self.i1ps(stretch), c10, c20, c30)
+        return self.f(kinematics(2, stretch), 2, c10, c20, c30)
 
     def ut_jac(self, stretch, c10, c20, c30):
         """Returns the gradient vector of the Yeoh model to uniaxial tension."""
-        return self.jac(stretch, 1, self.i1ut(stretch))
+        return self.jac(kinematics(0, stretch), 1)
 
     def et_jac(self, stretch, c10, c20, c30):
         """Returns the gradient vector of the Yeoh model to equibiaxial tension."""
-        return self.jac(stretch, 4, self.i1et(stretch))
+        return self.jac(kinematics(1, stretch), 4)
 
     def ps_jac(self, stretch, c10, c20, c30):
         """Returns the gradient vector of the Yeoh model to pure shear."""
-        return self.jac(stretch, 2, self.i1ps(stretch))
+        return self.jac(kinematics(2, stretch), 2)
 
     def ut_hess(self, stretch, c10, c20, c30):
         """Returns the Hessian matrix of the Yeoh model to uniaxial tension."""